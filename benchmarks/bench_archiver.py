@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import shutil
+import zipfile
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from archiver import archive_files, archive_codec
+
+# ==============================
+# === CONFIG ==================
+# ==============================
+BENCH_FILES = int(os.environ.get("BENCH_FILES", "8"))
+BENCH_FILE_MB = int(os.environ.get("BENCH_FILE_MB", "32"))
+BENCH_WORKERS = [int(w) for w in os.environ.get("BENCH_WORKERS", "1,4").split(",")]
+BENCH_CODECS = os.environ.get("BENCH_CODECS", "zip:6,gzip:1,gzip:6,zstd:3").split(",")
+
+# ==============================
+# === SYNTHETIC RAW FILES =====
+# ==============================
+def make_raw_files(folder, n, size_mb):
+    """Pipe-delimited order-like text (compresses roughly like the real landing files)."""
+    rng = np.random.default_rng(7)
+    segments = np.array(["Consumer", "Corporate", "Home Office"])
+    lines_per_file = size_mb * 1024 * 1024 // 120
+    for i in range(n):
+        ids = rng.integers(0, 100000, lines_per_file)
+        body = "\n".join(f"{k}|CA-2024-{j:06d}|11/08/2024|Second Class|CU-{j % 800:05d}|{segments[j % 3]}|"
+                         f"United States|Henderson|Kentucky|42420|South|{j * 0.37:.4f}"
+                         for k, j in enumerate(ids))
+        with open(os.path.join(folder, f"012024_orders_2024_01_{i + 1:02d}_00_00_00.csv"), "w") as f:
+            f.write(body)
+
+def legacy_archive(folder, archive_dir):
+    # Previous behaviour: one file at a time, ZipFile.write at the default level
+    os.makedirs(archive_dir, exist_ok=True)
+    for fname in sorted(os.listdir(folder)):
+        path = os.path.join(folder, fname)
+        with zipfile.ZipFile(os.path.join(archive_dir, f"{os.path.splitext(fname)[0]}.zip"), "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.write(path, arcname=fname)
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    work = tempfile.mkdtemp(prefix="bench_archiver_")
+    source = os.path.join(work, "source")
+    os.makedirs(source)
+    make_raw_files(source, BENCH_FILES, BENCH_FILE_MB)
+    total_mb = sum(os.path.getsize(os.path.join(source, f)) for f in os.listdir(source)) / 1e6
+    print(f"📄 {BENCH_FILES} raw files, {total_mb:.0f} MB")
+
+    def fresh_copy():
+        folder = os.path.join(work, "processed")
+        shutil.rmtree(folder, ignore_errors=True)
+        shutil.copytree(source, folder)
+        return folder
+
+    try:
+        folder = fresh_copy()
+        started = time.perf_counter()
+        legacy_archive(folder, os.path.join(work, "legacy"))
+        print(f"[✓] legacy zip      serial    {time.perf_counter() - started:7.2f}s")
+
+        for spec in BENCH_CODECS:
+            codec, level = spec.split(":")
+            if archive_codec(codec) != codec:
+                continue
+            for workers in BENCH_WORKERS:
+                folder = fresh_copy()
+                paths = [os.path.join(folder, f) for f in sorted(os.listdir(folder))]
+                out = os.path.join(work, f"{codec}_{level}_{workers}")
+                started = time.perf_counter()
+                results, errors = archive_files(paths, out, codec=codec, level=int(level), workers=workers)
+                elapsed = time.perf_counter() - started
+                assert not errors and len(results) == BENCH_FILES
+                ratio = sum(r["bytes_out"] for r in results) / sum(r["bytes_in"] for r in results)
+                print(f"[✓] {codec:<5} level {level:<3} workers={workers:<2} {elapsed:7.2f}s  ratio {ratio:.3f}  (verified)")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from mdm_consolidation import build_golden_records, apply_golden_changes
+
+# ==============================
+# === CONFIG ==================
+# ==============================
+BENCH_ROWS = int(os.environ.get("BENCH_ROWS", "1000000"))
+BENCH_KEYS = int(os.environ.get("BENCH_KEYS", "100000"))
+LEGACY_KEYS = int(os.environ.get("BENCH_LEGACY_KEYS", "5000"))  # per-key loop is quadratic, time a slice
+
+KEY_COL = "Customer ID"
+FIELDS = ["Customer Name", "Segment"]
+
+# ==============================
+# === SYNTHETIC PRD ===========
+# ==============================
+def synthetic_prd(n_rows, n_keys):
+    rng = np.random.default_rng(7)
+    keys = rng.integers(0, n_keys, n_rows)
+    names = np.array([f"Customer {i}" for i in range(n_keys)], dtype=object)
+    df = pd.DataFrame({
+        "Row ID": np.arange(1, n_rows + 1),
+        KEY_COL: pd.Series(keys).map("CU-{:06d}".format),
+        "Customer Name": np.where(rng.random(n_rows) < 0.2, None, names[keys]),
+        "Segment": np.where(rng.random(n_rows) < 0.3, "", rng.choice(["Consumer", "Corporate", "Home Office"], n_rows)),
+        "changetype": rng.choice(["I", "U", "D"], n_rows, p=[0.6, 0.38, 0.02]),
+        "is_deleted": False,
+    })
+    df["is_deleted"] = df["changetype"] == "D"
+    return df
+
+def existing_golden(df_inc):
+    """Golden set as left by a previous run: every other key already mastered."""
+    keys = df_inc[KEY_COL].drop_duplicates().iloc[::2]
+    return pd.DataFrame({KEY_COL: keys.values, "Customer Name": "old", "Segment": "old",
+                         "source_list": "", "golden_score": 0, "last_updated": ""})
+
+# ==============================
+# === LEGACY (pre-vectorized) =
+# ==============================
+def legacy_consolidate(df_inc, df_existing):
+    for key, group in df_inc.groupby(KEY_COL):
+        if group["changetype"].iloc[-1] == "D" or group["is_deleted"].iloc[-1]:
+            df_existing = df_existing[df_existing[KEY_COL] != key]
+            continue
+        group = group.fillna("")
+        group["score"] = group[FIELDS].apply(lambda row: sum([1 for v in row if str(v).strip() != ""]), axis=1)
+        best = group.sort_values(by="score", ascending=False, kind="stable").iloc[0]
+        record = {KEY_COL: key, **{f: best[f] for f in FIELDS}}
+        record["source_list"] = ",".join(group["Row ID"].astype(str).unique())
+        record["golden_score"] = best["score"]
+        df_existing = df_existing[df_existing[KEY_COL] != key]
+        df_existing = pd.concat([df_existing, pd.DataFrame([record])])
+    return df_existing
+
+def vectorized_consolidate(df_inc, df_existing):
+    golden, delete_keys = build_golden_records(df_inc, KEY_COL, FIELDS)
+    return apply_golden_changes(df_existing, golden, delete_keys, KEY_COL)
+
+def comparable(df):
+    return df.drop(columns=["last_updated"]).sort_values(KEY_COL).reset_index(drop=True).astype(str)
+
+
+if __name__ == "__main__":
+    df = synthetic_prd(BENCH_ROWS, BENCH_KEYS)
+    print(f"📄 Synthetic PRD: {len(df)} rows, {df[KEY_COL].nunique()} distinct keys")
+
+    # Correctness + legacy timing on a slice of keys
+    slice_keys = df[KEY_COL].drop_duplicates().iloc[:LEGACY_KEYS]
+    df_slice = df[df[KEY_COL].isin(slice_keys)]
+    started = time.perf_counter()
+    legacy = legacy_consolidate(df_slice, existing_golden(df_slice))
+    legacy_s = time.perf_counter() - started
+    vectorized = vectorized_consolidate(df_slice, existing_golden(df_slice))
+    pd.testing.assert_frame_equal(comparable(legacy), comparable(vectorized))
+    print(f"[✓] legacy     {LEGACY_KEYS:>7} keys: {legacy_s:8.2f}s (results identical)")
+
+    # Full run
+    started = time.perf_counter()
+    result = vectorized_consolidate(df, existing_golden(df))
+    full_s = time.perf_counter() - started
+    print(f"[✓] vectorized {df[KEY_COL].nunique():>7} keys: {full_s:8.2f}s  → {len(result)} golden records")
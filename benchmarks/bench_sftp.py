@@ -0,0 +1,156 @@
+import os
+import sys
+import json
+import time
+import logging
+import shutil
+import socket
+import tempfile
+import threading
+from functools import partial
+import paramiko
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from sftp_downloader import open_sftp, close_sftp, download_new_files, PART_SUFFIX, remote_signature
+
+# ==============================
+# === CONFIG ==================
+# ==============================
+BENCH_FILES = int(os.environ.get("BENCH_FILES", "12"))
+BENCH_FILE_MB = int(os.environ.get("BENCH_FILE_MB", "16"))
+BENCH_WORKERS = [int(w) for w in os.environ.get("BENCH_WORKERS", "1,4,8").split(",")]
+
+# Server-side transports log a reset for every client disconnect
+logging.getLogger("paramiko").setLevel(logging.CRITICAL)
+
+# ==============================
+# === LOCAL SFTP STAND-IN =====
+# ==============================
+# Minimal read-only paramiko SFTP server exposing one local directory.
+
+class StandInServer(paramiko.ServerInterface):
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED if kind == "session" else paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+
+class StandInHandle(paramiko.SFTPHandle):
+    def stat(self):
+        return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+
+
+class StandInSFTP(paramiko.SFTPServerInterface):
+    ROOT = None
+
+    def _local(self, path):
+        return os.path.join(self.ROOT, self.canonicalize(path).lstrip("/"))
+
+    def list_folder(self, path):
+        local = self._local(path)
+        out = []
+        for fname in os.listdir(local):
+            attr = paramiko.SFTPAttributes.from_stat(os.stat(os.path.join(local, fname)))
+            attr.filename = fname
+            out.append(attr)
+        return out
+
+    def stat(self, path):
+        return paramiko.SFTPAttributes.from_stat(os.stat(self._local(path)))
+
+    lstat = stat
+
+    def open(self, path, flags, attr):
+        if flags & (os.O_WRONLY | os.O_RDWR):
+            return paramiko.SFTP_PERMISSION_DENIED
+        handle = StandInHandle(flags)
+        handle.readfile = open(self._local(path), "rb")
+        handle.filename = path
+        return handle
+
+
+def serve(root):
+    """Start the stand-in on an ephemeral localhost port; returns (port, stop_event)."""
+    StandInSFTP.ROOT = root
+    host_key = paramiko.RSAKey.generate(2048)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(64)
+    sock.settimeout(0.2)
+    stop = threading.Event()
+
+    def accept_loop():
+        while not stop.is_set():
+            try:
+                client, _ = sock.accept()
+            except socket.timeout:
+                continue
+            transport = paramiko.Transport(client)
+            transport.add_server_key(host_key)
+            transport.set_subsystem_handler("sftp", paramiko.SFTPServer, StandInSFTP)
+            transport.start_server(server=StandInServer())
+        sock.close()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    return sock.getsockname()[1], stop
+
+# ==============================
+# === BENCHMARK ===============
+# ==============================
+def make_remote_files(root, n, size_mb):
+    for i in range(n):
+        with open(os.path.join(root, f"012024_orders_2024_01_{i + 1:02d}_00_00_00.csv"), "wb") as f:
+            f.write(os.urandom(size_mb * 1024 * 1024))
+
+
+if __name__ == "__main__":
+    work = tempfile.mkdtemp(prefix="bench_sftp_")
+    remote_root = os.path.join(work, "remote")
+    os.makedirs(os.path.join(remote_root, "orders"))
+    make_remote_files(os.path.join(remote_root, "orders"), BENCH_FILES, BENCH_FILE_MB)
+    total_mb = BENCH_FILES * BENCH_FILE_MB
+
+    port, stop = serve(remote_root)
+    connect = partial(open_sftp, "127.0.0.1", port, "bench", "bench")
+    print(f"📡 Stand-in SFTP on 127.0.0.1:{port} serving {BENCH_FILES} x {BENCH_FILE_MB} MB")
+
+    try:
+        for workers in BENCH_WORKERS:
+            local_dir = os.path.join(work, f"local_{workers}")
+            started = time.perf_counter()
+            result = download_new_files(connect, "/orders", local_dir, workers=workers)
+            elapsed = time.perf_counter() - started
+            assert len(result["downloaded"]) == BENCH_FILES and not result["failed"]
+            print(f"[✓] workers={workers:<2} {elapsed:7.2f}s  {total_mb / elapsed:8.1f} MB/s")
+
+        # Second run against the same folder: manifest should skip everything
+        started = time.perf_counter()
+        result = download_new_files(connect, "/orders", local_dir, workers=BENCH_WORKERS[-1])
+        assert not result["downloaded"] and len(result["skipped"]) == BENCH_FILES
+        print(f"[✓] re-run skipped {len(result['skipped'])} unchanged files in {time.perf_counter() - started:.2f}s")
+
+        # Resume: keep half of one file as a partial and re-fetch it
+        victim = sorted(os.listdir(os.path.join(remote_root, "orders")))[0]
+        local_path = os.path.join(local_dir, victim)
+        sftp = connect()
+        signature = remote_signature(sftp.stat(f"/orders/{victim}"))
+        close_sftp(sftp)
+        with open(local_path, "rb") as f:
+            half = f.read(signature["size"] // 2)
+        os.remove(local_path)
+        with open(local_path + PART_SUFFIX, "wb") as f:
+            f.write(half)
+        with open(local_path + PART_SUFFIX + ".json", "w") as f:
+            json.dump(signature, f)
+
+        result = download_new_files(connect, "/orders", local_dir, workers=1)
+        assert result["downloaded"] == [victim] and result["bytes"] == signature["size"] - len(half)
+        print(f"[✓] resumed {victim}: fetched {result['bytes']} of {signature['size']} bytes")
+    finally:
+        stop.set()
+        shutil.rmtree(work, ignore_errors=True)
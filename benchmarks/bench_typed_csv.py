@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from typed_csv import read_typed_csv, resolve_schema
+
+# ==============================
+# === CONFIG ==================
+# ==============================
+BENCH_ROWS = int(os.environ.get("BENCH_ROWS", "1000000"))
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config", "orders", "schema.yml")
+
+with open(SCHEMA_PATH, "r") as f:
+    schema_cfg = yaml.safe_load(f)
+
+# ==============================
+# === SYNTHETIC LANDING FILE ==
+# ==============================
+def synthetic_orders(n):
+    rng = np.random.default_rng(7)
+    dates = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, n), unit="D")
+    return pd.DataFrame({
+        "Row ID": np.arange(1, n + 1),
+        "Order ID": pd.Series(rng.integers(0, n // 3, n)).map("CA-2024-{:06d}".format),
+        "Order Date": dates.strftime("%d/%m/%Y"),
+        "Ship Date": (dates + pd.Timedelta(days=4)).strftime("%d/%m/%Y"),
+        "Ship Mode": rng.choice(["Standard Class", "Second Class", "First Class", "Same Day"], n),
+        "Customer ID": pd.Series(rng.integers(0, 800, n)).map("CU-{:05d}".format),
+        "Customer Name": pd.Series(rng.integers(0, 800, n)).map("Customer {}".format),
+        "Segment": rng.choice(["Consumer", "Corporate", "Home Office"], n),
+        "Country": "United States",
+        "City": rng.choice(["Henderson", "Los Angeles", "Seattle", "Houston"], n),
+        "State": rng.choice(["Kentucky", "California", "Washington", "Texas"], n),
+        "Postal Code": rng.integers(10000, 99999, n).astype(str),
+        "Region": rng.choice(["South", "West", "Central", "East"], n),
+        "Product ID": pd.Series(rng.integers(0, 1800, n)).map("FUR-BO-{:08d}".format),
+        "Category": rng.choice(["Furniture", "Office Supplies", "Technology"], n),
+        "Sub-Category": rng.choice(["Bookcases", "Chairs", "Labels", "Tables", "Phones"], n),
+        "Product Name": pd.Series(rng.integers(0, 1800, n)).map("Product {}".format),
+        "Sales": rng.random(n).round(4) * 1000,
+        "Quantity": rng.integers(1, 14, n),
+        "Discount": rng.choice([0.0, 0.2, 0.45], n),
+        "Profit": rng.normal(20, 50, n).round(4),
+    })
+
+def legacy_read(path):
+    # Previous path: infer everything, then cast each column (VARCHAR via astype(str))
+    df = pd.read_csv(path, sep="|")
+    for col, col_type in resolve_schema(df.columns, schema_cfg["columns"]).items():
+        if col_type == "INTEGER":
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        elif col_type == "NUMERIC":
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        elif col_type == "DATE":
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+        else:
+            df[col] = df[col].astype(str)
+    return df
+
+def measure(label, fn):
+    started = time.perf_counter()
+    df = fn()
+    elapsed = time.perf_counter() - started
+    mem_mb = df.memory_usage(deep=True).sum() / 1e6
+    print(f"[✓] {label:<16} {elapsed:7.2f}s  frame {mem_mb:8.1f} MB")
+    return df
+
+
+if __name__ == "__main__":
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_typed_csv_"), "012024_orders_2024_01_31_00_00_00.csv")
+    synthetic_orders(BENCH_ROWS).to_csv(path, sep="|", index=False)
+    print(f"📄 Synthetic landing file: {BENCH_ROWS} rows, {os.path.getsize(path) / 1e6:.1f} MB")
+
+    measure("legacy", lambda: legacy_read(path))
+    typed = measure("typed (c)", lambda: read_typed_csv(path, schema_cfg["columns"], categoricals=schema_cfg.get("categorical", [])))
+    arrow = measure("typed (pyarrow)", lambda: read_typed_csv(path, schema_cfg["columns"], categoricals=schema_cfg.get("categorical", []),
+                                                              engine="pyarrow"))
+    pd.testing.assert_frame_equal(typed, arrow, check_dtype=False, check_categorical=False)
+    print(f"[✓] engines agree; dtypes: {dict(typed.dtypes.astype(str).value_counts())}")
+    os.remove(path)
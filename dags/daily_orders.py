@@ -1,6 +1,5 @@
 from airflow import DAG
 from airflow.operators.python import PythonOperator
-from airflow.utils.task_group import TaskGroup
 from airflow.utils.email import send_email
 from datetime import datetime, timedelta
 import os
@@ -60,11 +59,10 @@ def run_dq_checks(**kwargs):
     from dq_checks import run_dq
     run_dq(PATHS["postgres"]["stg"], DQ_CHECKS)
 
-def run_mdm_entity(entity_name):
-    def _run(**kwargs):
-        from mdm import process_mdm
-        process_mdm(PATHS["postgres"]["prd"], PATHS["postgres"]["mdm"], entity_name)
-    return _run
+def run_mdm_entities(**kwargs):
+    # One PRD delta read shared by customers/products/countries, consolidated in threads
+    from mdm import run_mdm
+    run_mdm(entities=["customers", "products", "countries"])
 
 def run_load_dw(**kwargs):
     from load_dw import load_dw_main
@@ -114,25 +112,13 @@ t4_dq = PythonOperator(
     dag=dag
 )
 
-# MDM entities parallelized
-with TaskGroup("mdm_processing", tooltip="Process each MDM entity") as mdm_group:
-    mdm_customers = PythonOperator(
-        task_id="mdm_customers",
-        python_callable=run_mdm_entity("customers"),
-        on_failure_callback=notify_email
-    )
-
-    mdm_products = PythonOperator(
-        task_id="mdm_products",
-        python_callable=run_mdm_entity("products"),
-        on_failure_callback=notify_email
-    )
-
-    mdm_countries = PythonOperator(
-        task_id="mdm_countries",
-        python_callable=run_mdm_entity("countries"),
-        on_failure_callback=notify_email
-    )
+# MDM entities consolidated in parallel inside one task (single PRD extraction)
+t_mdm = PythonOperator(
+    task_id="mdm_processing",
+    python_callable=run_mdm_entities,
+    on_failure_callback=notify_email,
+    dag=dag
+)
 
 t5_dw = PythonOperator(
     task_id="load_dw",
@@ -144,4 +130,4 @@ t5_dw = PythonOperator(
 # ============================
 # Dependencies
 # ============================
-t1_sftp >> t2_fs >> t3_stg_prd >> t4_dq >> mdm_group >> t5_dw
+t1_sftp >> t2_fs >> t3_stg_prd >> t4_dq >> t_mdm >> t5_dw
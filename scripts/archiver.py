@@ -0,0 +1,153 @@
+import os
+import gzip
+import hashlib
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+# ==============================
+# === STREAMING ARCHIVER ======
+# ==============================
+# Compresses processed raw files block by block into ARCHIVE_DIR, then
+# re-reads the archive and compares the decompressed SHA-256 with the source
+# before the source is deleted. Codecs:
+#   zip   ZIP_DEFLATED (the original format), level 0-9
+#   gzip  .gz, level 1-9
+#   zstd  .zst, level 1-22 (needs the optional `zstandard` package; gzip at its
+#         default level otherwise)
+# Levels outside a codec's range are clamped to it.
+# zlib and zstd release the GIL, so a thread pool scales; "process" is available too.
+
+BLOCK_BYTES = 1024 * 1024
+ARCHIVE_CODECS = ("zip", "gzip", "zstd")
+DEFAULT_LEVELS = {"zip": 6, "gzip": 6, "zstd": 3}
+LEVEL_RANGES = {"zip": (0, 9), "gzip": (0, 9), "zstd": (1, 22)}
+EXTENSIONS = {"zip": ".zip", "gzip": ".gz", "zstd": ".zst"}
+
+
+def archive_codec(name):
+    """Requested codec, falling back to gzip when zstandard is not installed."""
+    if name not in ARCHIVE_CODECS:
+        raise ValueError(f"Unknown archive codec {name!r}, expected one of {ARCHIVE_CODECS}")
+    if name == "zstd":
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            print("[!] zstandard not installed, archiving with gzip")
+            return "gzip"
+    return name
+
+
+def _open_writer(codec, path, arcname, level):
+    """Writable binary stream for one archive member; returns (stream, closers)."""
+    if codec == "gzip":
+        stream = gzip.open(path, "wb", compresslevel=level)
+        return stream, [stream]
+    if codec == "zstd":
+        import zstandard
+        fh = open(path, "wb")
+        stream = zstandard.ZstdCompressor(level=level).stream_writer(fh, closefd=False)
+        return stream, [stream, fh]
+    zf = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=level)
+    stream = zf.open(arcname, "w", force_zip64=True)
+    return stream, [stream, zf]
+
+
+def _open_reader(codec, path, arcname):
+    if codec == "gzip":
+        stream = gzip.open(path, "rb")
+        return stream, [stream]
+    if codec == "zstd":
+        import zstandard
+        fh = open(path, "rb")
+        stream = zstandard.ZstdDecompressor().stream_reader(fh)
+        return stream, [stream, fh]
+    zf = zipfile.ZipFile(path, "r")
+    stream = zf.open(arcname, "r")
+    return stream, [stream, zf]
+
+
+def _close_all(closers):
+    for c in closers:
+        c.close()
+
+
+def stream_digest(stream, block_bytes=BLOCK_BYTES, sink=None):
+    """SHA-256 of everything read from stream (optionally copying each block to sink)."""
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        block = stream.read(block_bytes)
+        if not block:
+            break
+        digest.update(block)
+        size += len(block)
+        if sink is not None:
+            sink.write(block)
+    return digest.hexdigest(), size
+
+
+def archive_file(src_path, archive_dir, codec="zip", level=None, block_bytes=BLOCK_BYTES):
+    """Compress src_path into archive_dir, verify it, then delete the source.
+
+    Returns {"source", "archive", "bytes_in", "bytes_out", "sha256"}; raises (keeping the
+    source and removing the partial archive) if compression fails or the decompressed
+    archive does not match.
+    """
+    lo, hi = LEVEL_RANGES[codec]
+    level = DEFAULT_LEVELS[codec] if level is None else min(max(int(level), lo), hi)
+    base = os.path.basename(src_path)
+    stem = os.path.splitext(base)[0] if codec == "zip" else base
+    archive_path = os.path.join(archive_dir, stem + EXTENSIONS[codec])
+    tmp_path = os.path.join(archive_dir, f".{stem}{EXTENSIONS[codec]}.tmp")
+
+    try:
+        writer, closers = _open_writer(codec, tmp_path, base, level)
+        try:
+            with open(src_path, "rb") as src:
+                source_sha, bytes_in = stream_digest(src, block_bytes, sink=writer)
+        finally:
+            _close_all(closers)
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+
+        reader, closers = _open_reader(codec, tmp_path, base)
+        try:
+            archived_sha, _ = stream_digest(reader, block_bytes)
+        finally:
+            _close_all(closers)
+        if archived_sha != source_sha:
+            raise IOError(f"Archive of {src_path} failed verification ({archived_sha} != {source_sha})")
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    os.replace(tmp_path, archive_path)
+    os.remove(src_path)
+    return {"source": src_path, "archive": archive_path, "bytes_in": bytes_in,
+            "bytes_out": os.path.getsize(archive_path), "sha256": source_sha}
+
+
+def archive_files(paths, archive_dir, codec="zip", level=None, workers=4, pool="thread"):
+    """Archive paths concurrently; returns (results sorted by source, {source: exception})."""
+    os.makedirs(archive_dir, exist_ok=True)
+    requested, codec = codec, archive_codec(codec)
+    if codec != requested:
+        level = None  # the requested codec's level means nothing to the fallback
+    results, errors = [], {}
+    if not paths:
+        return results, errors
+
+    executor = ProcessPoolExecutor if pool == "process" else ThreadPoolExecutor
+    with executor(max_workers=max(1, min(workers, len(paths)))) as ex:
+        futures = {ex.submit(archive_file, p, archive_dir, codec, level): p for p in paths}
+        for fut in as_completed(futures):
+            src = futures[fut]
+            try:
+                result = fut.result()
+                results.append(result)
+                print(f"📦 Archived {src} → {result['archive']} ({result['bytes_in']} → {result['bytes_out']} bytes)")
+            except Exception as e:
+                errors[src] = e
+                print(f"[!] Failed to archive {src}: {e}")
+    return sorted(results, key=lambda r: r["source"]), errors
@@ -0,0 +1,190 @@
+import os
+import atexit
+import threading
+from datetime import datetime
+import pandas as pd
+from sqlalchemy import text
+from pg_copy import copy_frame
+
+# ==============================
+# === BUFFERED AUDIT SINK =====
+# ==============================
+# Collects audit events in memory and writes them in bulk once `flush_rows`
+# events are buffered, on flush()/close(), and at interpreter exit.
+# Logs are append-only; nothing already written is read back or rewritten.
+# Backends:
+#   csv      append lines to one CSV file (header written once), fsync'd
+#   jsonl    append one JSON object per line, fsync'd
+#   parquet  one part file per flush inside a dataset directory
+#   postgres COPY into a table (e.g. "audit.mdm_audit_log")
+# compact() rolls entries older than a cutoff into Parquet under an archive dir.
+
+AUDIT_BACKENDS = ("csv", "jsonl", "parquet", "postgres")
+
+# Shared by load_to_fs.py (status "downloaded") and load_to_stg_prd.py (status "staged")
+FILE_AUDIT_COLUMNS = ["filename", "sourcemonthyear_key", "tablename", "sourcefiledate_key", "file_datetime",
+                      "file_size_bytes", "checksum", "status", "ingested_at",
+                      "rows_read", "rows_loaded", "rows_failed"]
+MERGE_AUDIT_COLUMNS = ["filename", "target_table", "inserted_count", "updated_count",
+                       "marked_deleted_count", "run_started", "run_finished"]
+
+
+class AuditSink:
+    def __init__(self, columns, backend="csv", path=None, table=None, engine=None, flush_rows=10000):
+        if backend not in AUDIT_BACKENDS:
+            raise ValueError(f"Unknown audit backend {backend!r}, expected one of {AUDIT_BACKENDS}")
+        if backend in ("csv", "jsonl", "parquet") and not path:
+            raise ValueError(f"Audit backend {backend!r} needs a path")
+        if backend == "postgres" and (table is None or engine is None):
+            raise ValueError("Audit backend 'postgres' needs a table and an engine")
+
+        self.columns = list(columns)
+        self.backend = backend
+        self.path = path
+        self.table = table
+        self.engine = engine
+        self.flush_rows = flush_rows
+        self._frames = []
+        self._buffered = 0
+        self._lock = threading.Lock()
+        self._header_checked = False
+        atexit.register(self.flush)
+
+    @classmethod
+    def from_config(cls, columns, cfg, path, table, engine=None, table_key="table"):
+        """Sink for a paths.yml audit section ({backend, <table_key>, flush_rows}).
+
+        `path` is the CSV log; jsonl uses the same name with a .jsonl suffix and
+        parquet a directory named after it.
+        """
+        backend = cfg.get("backend", "csv")
+        stem = os.path.splitext(path)[0]
+        path = {"jsonl": stem + ".jsonl", "parquet": stem}.get(backend, path)
+        return cls(columns, backend=backend, path=path, table=cfg.get(table_key, table),
+                   engine=engine, flush_rows=cfg.get("flush_rows", 10000))
+
+    def add(self, record):
+        self.add_many(pd.DataFrame([record]))
+
+    def add_many(self, df):
+        """Buffer a frame of events (missing columns are left empty)."""
+        if df.empty:
+            return
+        with self._lock:
+            self._frames.append(df.reindex(columns=self.columns))
+            self._buffered += len(df)
+            should_flush = self._buffered >= self.flush_rows
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._frames:
+                return 0
+            df = pd.concat(self._frames, ignore_index=True)
+            self._frames, self._buffered = [], 0
+            getattr(self, f"_write_{self.backend}")(df)
+        return len(df)
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- backends ---
+    def _append_lines(self, write):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8", newline="") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_csv(self, df):
+        exists = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        if exists and not self._header_checked:
+            self._align_csv_header()
+        self._header_checked = True
+        self._append_lines(lambda f: df.to_csv(f, header=not exists, index=False))
+
+    def _align_csv_header(self):
+        """One-off rewrite of a log written with another column layout (e.g. before this sink)."""
+        with open(self.path, "r", encoding="utf-8") as f:
+            header = f.readline().rstrip("\r\n").split(",")
+        if header == self.columns:
+            return
+        old = pd.read_csv(self.path, dtype=str, keep_default_na=False)
+        tmp_path = self.path + ".tmp"
+        old.reindex(columns=self.columns).to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+        print(f"[!] Audit log {self.path} rewritten once with columns {self.columns}")
+
+    def _write_jsonl(self, df):
+        self._append_lines(lambda f: f.write(df.to_json(orient="records", lines=True, date_format="iso", date_unit="us")
+                                             .rstrip("\n") + "\n"))
+
+    def _write_parquet(self, df, path=None):
+        path = path or self.path
+        os.makedirs(path, exist_ok=True)
+        part = f"part-{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{os.getpid()}.parquet"
+        df.astype(str).where(df.notna(), None).to_parquet(os.path.join(path, part), index=False)
+
+    def _write_postgres(self, df):
+        with self.engine.begin() as conn:
+            if "." in self.table:
+                conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self.table.split('.')[0]}"))
+            cols = ", ".join(f'"{c}" TEXT' for c in self.columns)
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {self.table} ({cols})"))
+            copy_frame(conn, self.table, df)
+
+    # --- compaction ---
+    def compact(self, time_col, before, archive_dir):
+        """Move entries with time_col < before into a Parquet part under archive_dir.
+
+        Run while nothing else appends to the log (e.g. between pipeline runs).
+        Returns the number of entries archived.
+        """
+        self.flush()
+        before = pd.Timestamp(before)
+        before = before.tz_localize("UTC") if before.tzinfo is None else before
+        with self._lock:
+            if self.backend == "postgres":
+                return self._compact_postgres(time_col, before, archive_dir)
+            if self.backend in ("csv", "jsonl"):
+                return self._compact_file(time_col, before, archive_dir)
+            return 0  # parquet logs are already columnar
+
+    def _compact_file(self, time_col, before, archive_dir):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return 0
+        if self.backend == "csv":
+            df = pd.read_csv(self.path, dtype=str, keep_default_na=False)
+        else:
+            df = pd.read_json(self.path, lines=True, dtype=False, convert_dates=False)
+        ts = pd.to_datetime(df[time_col], errors="coerce", utc=True, format="ISO8601")
+        old = (ts < before).to_numpy()
+        if not old.any():
+            return 0
+
+        self._write_parquet(df[old], archive_dir)
+        tmp_path = self.path + ".tmp"
+        if self.backend == "csv":
+            df[~old].to_csv(tmp_path, index=False)
+        else:
+            df[~old].to_json(tmp_path, orient="records", lines=True)
+        os.replace(tmp_path, self.path)
+        return int(old.sum())
+
+    def _compact_postgres(self, time_col, before, archive_dir):
+        predicate = f'NULLIF("{time_col}", \'\')::timestamptz < :before'
+        with self.engine.begin() as conn:
+            df = pd.read_sql(text(f"SELECT * FROM {self.table} WHERE {predicate}"), conn, params={"before": before})
+            if df.empty:
+                return 0
+            self._write_parquet(df, archive_dir)
+            conn.execute(text(f"DELETE FROM {self.table} WHERE {predicate}"), {"before": before})
+        return len(df)
@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+
+# ==============================
+# === ENTITY RESOLUTION =======
+# ==============================
+# Near-duplicate detection over golden-record names (e.g. "Customer Name"),
+# without comparing all pairs. Every name gets blocking keys:
+#   prefix    first PREFIX_LEN characters of the normalized, space-free name
+#   phonetic  Soundex of the first and the last token
+#   minhash   LSH bands of a MinHash signature over character 3-grams
+# Only records sharing a block are compared (blocks above max_block_size are
+# too unspecific and skipped), candidates are scored by the MinHash estimate
+# of their 3-gram Jaccard similarity, and matches are grouped into clusters
+# with connected components.
+
+NOISE_TOKENS = ["inc", "llc", "ltd", "co", "corp", "corporation", "company", "the"]
+MAX_NAME_BYTES = 64
+PREFIX_LEN = 4
+NUM_PERM = 64
+BANDS = 16
+MAX_BLOCK_SIZE = 100
+PAIR_BATCH = 2_000_000
+_EMPTY_HASH = np.uint64((1 << 32) - 1)
+_SOUNDEX_CODES = {c: d for d, letters in {"1": "bfpv", "2": "cgjkqsxz", "3": "dt",
+                                          "4": "l", "5": "mn", "6": "r"}.items() for c in letters}
+
+
+def normalize_names(names):
+    """Lower-case ASCII names with punctuation, legal suffixes and extra spaces removed."""
+    s = pd.Series(names, dtype=object).fillna("").astype(str)
+    s = s.str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii").str.lower()
+    s = s.str.replace(r"[^a-z0-9 ]+", " ", regex=True)
+    s = s.str.replace(r"\b(?:" + "|".join(NOISE_TOKENS) + r")\b", " ", regex=True)
+    return s.str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def soundex(word):
+    if not word:
+        return ""
+    codes = [_SOUNDEX_CODES.get(c, "") for c in word]
+    out, last = word[0], codes[0]
+    for c, code in zip(word[1:], codes[1:]):
+        if code and code != last:
+            out += code
+        if c not in "hw":
+            last = code
+    return (out + "000")[:4]
+
+
+def _key_hash(keys, salt):
+    return pd.util.hash_array(np.asarray(salt + keys, dtype=object), categorize=True)
+
+
+def minhash_signatures(norm, num_perm=NUM_PERM, seed=7, chunk_rows=100_000):
+    """(n, num_perm) MinHash signatures over the character 3-grams of each space-padded name.
+
+    Names are processed in length order so every chunk's gram matrix is only as wide as
+    its longest name; grams are hashed with multiply-shift (a * g + b) >> 32.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 63, num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+    raw = (" " + pd.Series(norm, dtype=object) + " ").to_numpy(dtype=object).astype(f"S{MAX_NAME_BYTES}")
+    lengths = np.char.str_len(raw)
+    order = np.argsort(lengths, kind="stable")
+    sig = np.empty((len(raw), num_perm), dtype=np.uint32)
+    for start in range(0, len(raw), chunk_rows):
+        rows = order[start:start + chunk_rows]
+        width = max(int(lengths[rows].max()), 3)
+        chars = raw[rows].view(np.uint8).reshape(-1, MAX_NAME_BYTES)[:, :width].astype(np.uint64)
+        grams = (chars[:, :-2] << np.uint64(16)) | (chars[:, 1:-1] << np.uint64(8)) | chars[:, 2:]
+        valid = np.arange(width - 2) < (lengths[rows, None] - 2)
+        for k in range(num_perm):
+            h = (a[k] * grams + b[k]) >> np.uint64(32)
+            sig[rows, k] = np.where(valid, h, _EMPTY_HASH).min(axis=1)
+    return sig
+
+
+def blocking_keys(norm, sig, bands=BANDS, prefix_len=PREFIX_LEN):
+    """DataFrame (block, record): every blocking key of every matchable record."""
+    norm = pd.Series(norm).reset_index(drop=True)
+    matchable = (norm.str.len() >= 3).to_numpy()
+    records = np.flatnonzero(matchable)
+    if not len(records):
+        return pd.DataFrame({"block": np.empty(0, np.uint64), "record": np.empty(0, np.int64)})
+    compact = norm[matchable].str.replace(" ", "", regex=False)
+    tokens = norm[matchable].str.split(" ")
+    codes = {t: soundex(t) for t in pd.unique(pd.concat([tokens.str[0], tokens.str[-1]]))}
+
+    frames = [
+        pd.DataFrame({"block": _key_hash(compact.str[:prefix_len].to_numpy(), "p:"), "record": records}),
+        pd.DataFrame({"block": _key_hash((tokens.str[0].map(codes) + tokens.str[-1].map(codes)).to_numpy(), "s:"),
+                      "record": records}),
+    ]
+    rows = sig.shape[1] // bands
+    for band in range(bands):
+        part = sig[records, band * rows:(band + 1) * rows].astype(np.uint64)
+        h = np.full(len(records), np.uint64((band + 1) * 0x9E3779B97F4A7C15 % (1 << 64)))
+        for col in range(rows):
+            h = (h ^ part[:, col]) * np.uint64(0x100000001B3)
+        frames.append(pd.DataFrame({"block": h, "record": records}))
+    return pd.concat(frames, ignore_index=True).drop_duplicates()
+
+
+def candidate_pairs(blocks, max_block_size=MAX_BLOCK_SIZE, pair_batch=PAIR_BATCH):
+    """Yield (left, right) record arrays within blocks, batched to bound memory."""
+    sizes = blocks["block"].value_counts()
+    sizes = sizes[(sizes >= 2) & (sizes <= max_block_size)]
+    blocks = blocks[blocks["block"].isin(sizes.index)]
+    batch_of = pd.Series((sizes ** 2).cumsum().to_numpy() // pair_batch, index=sizes.index)
+    for _, batch in blocks.groupby(blocks["block"].map(batch_of), sort=False):
+        pairs = batch.merge(batch, on="block", suffixes=("_l", "_r"))
+        pairs = pairs[pairs["record_l"] < pairs["record_r"]]
+        yield pairs["record_l"].to_numpy(), pairs["record_r"].to_numpy()
+
+
+def connected_components(n, left, right):
+    """Component label (smallest member index) of each of n nodes."""
+    labels = np.arange(n)
+    while True:
+        low = np.minimum(labels[left], labels[right])
+        new = labels.copy()
+        np.minimum.at(new, left, low)
+        np.minimum.at(new, right, low)
+        new = new[new]
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def match_clusters(names, threshold=0.7, max_block_size=MAX_BLOCK_SIZE):
+    """Cluster near-duplicate names.
+
+    Returns (labels, stats): labels[i] is the position of the first record of i's
+    cluster (i itself when unmatched); stats counts blocks, compared pairs and matches.
+    """
+    norm = normalize_names(names)
+    if not len(norm):
+        return np.empty(0, np.int64), {"names": 0, "unique_names": 0, "blocks": 0, "pairs_compared": 0, "matches": 0}
+    codes, uniques = pd.factorize(norm)
+    sig = minhash_signatures(uniques)
+    blocks = blocking_keys(pd.Series(uniques), sig)
+
+    left, right, compared = [], [], 0
+    min_equal = int(np.ceil(threshold * sig.shape[1]))
+    for l, r in candidate_pairs(blocks, max_block_size):
+        compared += len(l)
+        similar = (sig[l] == sig[r]).sum(axis=1) >= min_equal
+        left.append(l[similar])
+        right.append(r[similar])
+    matches = pd.DataFrame({"l": np.concatenate(left), "r": np.concatenate(right)} if left else {"l": [], "r": []},
+                           dtype="int64").drop_duplicates()
+    left, right = matches["l"].to_numpy(), matches["r"].to_numpy()
+
+    # Records with the same normalized name share a unique name and so a cluster,
+    # except names too short to match, which stay on their own
+    unique_labels = connected_components(len(uniques), left, right)
+    groups = np.where(norm.str.len().to_numpy() >= 3, unique_labels[codes], len(uniques) + np.arange(len(codes)))
+    first_of = pd.Series(np.arange(len(codes))).groupby(groups).transform("min").to_numpy()
+    stats = {"names": len(codes), "unique_names": len(uniques), "blocks": blocks["block"].nunique(),
+             "pairs_compared": compared, "matches": len(left)}
+    return first_of, stats
@@ -1,6 +1,7 @@
 import os
 import yaml
-import pysftp
+from functools import partial
+from sftp_downloader import open_sftp, download_new_files, CHUNK_BYTES
 
 # === Load paths from YAML ===
 with open("paths.yaml", "r") as f:
@@ -22,25 +23,19 @@ SFTP_USERNAME = "your_username"
 SFTP_PASSWORD = "your_password"  # or use key authentication
 SFTP_REMOTE_PATH = "/remote/path/to/orders/"  # folder on SFTP
 
+# Parallel sessions; files already in DATA_FOLDER's manifest with the same size/mtime are skipped
+sftp_cfg = paths_cfg.get('sftp', {})
+SFTP_WORKERS = sftp_cfg.get('workers', 4)
+SFTP_CHUNK_BYTES = sftp_cfg.get('chunk_bytes', CHUNK_BYTES)
+
 # === Connect to SFTP and download files ===
-cnopts = pysftp.CnOpts()
-cnopts.hostkeys = None  # WARNING: disables host key checking, better to add host key in production
-
-with pysftp.Connection(host=SFTP_HOST, 
-                       username=SFTP_USERNAME, 
-                       password=SFTP_PASSWORD, 
-                       port=SFTP_PORT,
-                       cnopts=cnopts) as sftp:
-
-    print("Connected to SFTP.")
-    
-    # List all files in remote folder
-    remote_files = sftp.listdir(SFTP_REMOTE_PATH)
-    
-    for file in remote_files:
-        remote_file_path = os.path.join(SFTP_REMOTE_PATH, file)
-        local_file_path = os.path.join(DATA_FOLDER, file)
-        
-        # Download file
-        sftp.get(remote_file_path, local_file_path)
-        print(f"Downloaded {file} to {local_file_path}")
+# WARNING: host key checking is disabled (as before), better to verify the host key in production
+connect = partial(open_sftp, SFTP_HOST, SFTP_PORT, SFTP_USERNAME, SFTP_PASSWORD)
+
+result = download_new_files(connect, SFTP_REMOTE_PATH, DATA_FOLDER,
+                            workers=SFTP_WORKERS, chunk_bytes=SFTP_CHUNK_BYTES)
+
+print(f"Downloaded {len(result['downloaded'])} file(s) ({result['bytes']} bytes), "
+      f"skipped {len(result['skipped'])} unchanged, {len(result['failed'])} failed")
+if result["failed"]:
+    raise RuntimeError(f"SFTP download failed for: {', '.join(sorted(result['failed']))}")
@@ -1,7 +1,10 @@
+import argparse
+import json
 import pandas as pd
-import hashlib
 import datetime
 from sqlalchemy import create_engine, text
+from row_hashing import hash_frame
+from pg_copy import write_df
 
 # ============================
 # Configuration
@@ -14,60 +17,197 @@ PRD_SCHEMA = "prd"
 MDM_SCHEMA = "mdm"
 DW_SCHEMA = "dw"
 
+FACT_TABLE = "fact_orders_sales"
+FACT_COLS = ["Order ID","order_date_sk","ship_date_sk","customer_sk","product_sk","country_sk",
+             "Sales","Quantity","Discount","Profit","Ship Mode"]
+
+# Surrogate-key lookup for facts: "pushdown" joins current dimension rows inside Postgres,
+# "pandas" pulls the dimensions and merges in memory (fallback)
+FACT_LOOKUP_MODE = "pushdown"
+
+CUST_BK = ["Customer ID","Customer Name","Segment"]
+PROD_BK = ["Product ID","Product Name","Category","Sub-Category"]
+GEO_BK  = ["Country","City","State","Postal Code","Region"]
+WATERMARK_TABLE = f'{DW_SCHEMA}."etl_watermarks"'
+
+# Date dimension: materialized once, extended to the year-end covering the latest fact/current date,
+# and refreshed only for dates whose holiday flag changes (a fiscal start change rebuilds all)
+DIM_DATE_START = "2018-01-01"
+DIM_DATE_MIN_END = "2026-12-31"
+FISCAL_YEAR_START_MONTH = 1
+HOLIDAYS = []
+DIM_DATE_STATE_TABLE = f'{DW_SCHEMA}."etl_dim_date_state"'
+
+# Row hash mode for dimension hash_key ("sha256" keeps existing history valid)
+HASH_MODE = "sha256"
+
 # ============================
 # Helper Functions
 # ============================
-def row_hash(vals):
-    """Generate consistent row hash for SCD2 detection."""
-    normalized = ["<NULL>" if v is None or str(v).strip()=="" else str(v).strip().upper() for v in vals]
-    return hashlib.sha256("||".join(normalized).encode("utf-8")).hexdigest()
-
 def read_table(schema, table, columns=None):
     cols = "*" if columns is None else ", ".join(f'"{c}"' for c in columns)
     return pd.read_sql(f'SELECT {cols} FROM {schema}."{table}"', engine)
 
-def upsert_dim(df, table, bkeys):
-    """Upsert dimension table with SCD2 logic."""
-    df = df.copy()
+def ensure_current_key_index(table, bkeys):
+    """Migrate a dimension's uniqueness to one current row per business key.
+
+    The original upsert relied on plain unique keys over the business-key columns,
+    which reject every new SCD2 version. Those (and any other non-partial unique
+    index without surrogate_key) are dropped and replaced by a partial unique index
+    on bkeys WHERE current_flag. Idempotent, so it runs on every load.
+
+    That upsert also left one current row per attribute combination, so before the
+    index is built only the latest current row per business key stays current.
+    """
+    target = f'{DW_SCHEMA}."{table}"'
+    bkeys_str = ", ".join(f'"{c}"' for c in bkeys)
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            drop_legacy_unique_keys(conn, table)
+            index = f'"{table}_current_bk_uq" ON {target}'
+        else:
+            # SQLite qualifies the index name instead of the table
+            index = f'{DW_SCHEMA}."{table}_current_bk_uq" ON "{table}"'
+        expire_duplicate_current_rows(conn, table, bkeys)
+        conn.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ({bkeys_str}) WHERE current_flag"))
+
+def drop_legacy_unique_keys(conn, table):
+    """Drop non-partial unique constraints/indexes of a dimension that do not cover surrogate_key."""
+    target = f'{DW_SCHEMA}."{table}"'
+    legacy = conn.execute(text("""
+        SELECT i.indexrelid::regclass::text AS index_name, c.conname
+        FROM pg_index i
+        LEFT JOIN pg_constraint c ON c.conindid = i.indexrelid AND c.conrelid = i.indrelid
+        WHERE i.indrelid = CAST(:target AS regclass) AND i.indisunique AND i.indpred IS NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_attribute a
+              WHERE a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey) AND a.attname = 'surrogate_key')
+    """), {"target": target}).all()
+    for index_name, conname in legacy:
+        if conname:
+            conn.execute(text(f'ALTER TABLE {target} DROP CONSTRAINT "{conname}"'))
+        else:
+            conn.execute(text(f"DROP INDEX {index_name}"))
+        print(f"[!] {table}: dropped unique key {conname or index_name} (blocks SCD2 versions)")
+
+def expire_duplicate_current_rows(conn, table, bkeys):
+    """Keep one current row per business key (latest effective_from, then surrogate_key);
+    the others are closed at the kept row's effective_from."""
+    target = f'{DW_SCHEMA}."{table}"'
+    bkeys_str = ", ".join(f'"{c}"' for c in bkeys)
+    expired = conn.execute(text(f"""
+        UPDATE {target} AS d
+        SET effective_to = COALESCE(r.kept_from, :now), current_flag = false
+        FROM (
+            SELECT surrogate_key,
+                   ROW_NUMBER() OVER w AS rn,
+                   FIRST_VALUE(effective_from) OVER w AS kept_from
+            FROM {target}
+            WHERE current_flag
+            WINDOW w AS (PARTITION BY {bkeys_str}
+                         ORDER BY effective_from DESC NULLS LAST, surrogate_key DESC)
+        ) r
+        WHERE d.surrogate_key = r.surrogate_key AND r.rn > 1
+    """), {"now": datetime.datetime.utcnow()}).rowcount
+    if expired:
+        print(f"[!] {table}: closed {expired} older current rows sharing a business key")
+
+def upsert_dim(df, table, bkeys, hash_cols=None):
+    """Change-detecting SCD2 load of a dimension.
+
+    bkeys identify the entity; hash_cols (default: bkeys) are hashed to detect change.
+    For each incoming business key whose hash differs from the current version, the
+    current row is expired (effective_to = now, current_flag = false) and a new version
+    inserted; new keys are inserted; unchanged keys are not touched.
+    Business keys are compared with "=", so they must be non-null.
+    """
+    hash_cols = bkeys if hash_cols is None else hash_cols
+    df = df.drop_duplicates(subset=bkeys, keep="last").copy()
     now = datetime.datetime.utcnow()
-    df["hash_key"] = df[bkeys].apply(row_hash, axis=1)
+    # Only None counts as NULL here (NaN hashes as "NAN"), as in the original per-row helper
+    df["hash_key"] = hash_frame(df, hash_cols, mode=HASH_MODE, na_as_null=False)
     df["effective_from"] = now
-    df["effective_to"] = None
+    df["effective_to"] = pd.NaT
     df["current_flag"] = True
     df["source_info"] = f"{MDM_SCHEMA}.{table}"
 
-    # Batch upsert using temp table
+    target = f'{DW_SCHEMA}."{table}"'
     temp_table = f"temp_{table}"
-    df.to_sql(temp_table, engine, schema=DW_SCHEMA, if_exists="replace", index=False)
-
-    bkeys_str = ", ".join(f'"{col}"' for col in bkeys)
+    key_match = " AND ".join(f'd."{c}" = t."{c}"' for c in bkeys)
     col_names = ", ".join(f'"{c}"' for c in df.columns)
-    update_cols = ", ".join(f'"{c}"=EXCLUDED."{c}"' for c in df.columns if c not in bkeys + ["surrogate_key"])
 
-    sql = f"""
-    INSERT INTO {DW_SCHEMA}."{table}" ({col_names})
-    SELECT * FROM {DW_SCHEMA}."{temp_table}"
-    ON CONFLICT ({bkeys_str}) DO UPDATE SET {update_cols};
-    DROP TABLE {DW_SCHEMA}."{temp_table}";
-    """
-    engine.execute(text(sql))
+    with engine.begin() as conn:
+        # Stage incoming versions (empty table from the frame's dtypes, then COPY)
+        df.head(0).to_sql(temp_table, conn, schema=DW_SCHEMA, if_exists="replace", index=False)
+        write_df(df, temp_table, conn, schema=DW_SCHEMA)
 
-def upsert_fact(df_fact, table, pk_cols=["Order ID"]):
-    """Upsert fact table using primary key(s)."""
-    df_fact = df_fact.copy()
+        expired = conn.execute(text(f"""
+            UPDATE {target} AS d
+            SET effective_to = :now, current_flag = false
+            FROM {DW_SCHEMA}."{temp_table}" t
+            WHERE d.current_flag AND {key_match}
+              AND d.hash_key IS DISTINCT FROM t.hash_key
+        """), {"now": now}).rowcount
+
+        inserted = conn.execute(text(f"""
+            INSERT INTO {target} ({col_names})
+            SELECT {", ".join(f't."{c}"' for c in df.columns)}
+            FROM {DW_SCHEMA}."{temp_table}" t
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {target} d WHERE d.current_flag AND {key_match}
+            )
+        """)).rowcount
+
+        conn.execute(text(f'DROP TABLE {DW_SCHEMA}."{temp_table}"'))
+
+    print(f"[✓] {table}: {inserted - expired} new, {expired} changed, {len(df) - inserted} unchanged")
+    return {"inserted": inserted, "expired": expired}
+
+def upsert_fact(conn, df_fact, table, pk_cols=["Order ID"]):
+    """Upsert rows keyed on primary key(s) (facts, dim_date), on the caller's transaction."""
+    df_fact = df_fact.drop_duplicates(subset=pk_cols, keep="last")
     temp_table = f"temp_{table}"
-    df_fact.to_sql(temp_table, engine, schema=DW_SCHEMA, if_exists="replace", index=False)
+    df_fact.head(0).to_sql(temp_table, conn, schema=DW_SCHEMA, if_exists="replace", index=False)
+    write_df(df_fact, temp_table, conn, schema=DW_SCHEMA)
 
     pk_str = ", ".join(f'"{c}"' for c in pk_cols)
     update_cols = ", ".join(f'"{c}"=EXCLUDED."{c}"' for c in df_fact.columns if c not in pk_cols)
 
-    sql = f"""
+    conn.execute(text(f"""
     INSERT INTO {DW_SCHEMA}."{table}" ({', '.join(f'"{c}"' for c in df_fact.columns)})
-    SELECT * FROM {DW_SCHEMA}."{temp_table}"
-    ON CONFLICT ({pk_str}) DO UPDATE SET {update_cols};
-    DROP TABLE {DW_SCHEMA}."{temp_table}";
-    """
-    engine.execute(text(sql))
+    SELECT {', '.join(f'"{c}"' for c in df_fact.columns)} FROM {DW_SCHEMA}."{temp_table}"
+    WHERE true -- SQLite needs a WHERE before ON CONFLICT in INSERT ... SELECT
+    ON CONFLICT ({pk_str}) DO UPDATE SET {update_cols}
+    """))
+    conn.execute(text(f'DROP TABLE {DW_SCHEMA}."{temp_table}"'))
+
+def delete_fact(conn, keys, table, pk_col="Order ID"):
+    return conn.execute(text(f'DELETE FROM {DW_SCHEMA}."{table}" WHERE "{pk_col}" = ANY(:keys)'),
+                        {"keys": list(keys)}).rowcount
+
+# ============================
+# Incremental Watermarks
+# ============================
+def load_watermark(name):
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} (name VARCHAR PRIMARY KEY, watermark TIMESTAMP)"))
+        return conn.execute(text(f"SELECT watermark FROM {WATERMARK_TABLE} WHERE name = :name"), {"name": name}).scalar()
+
+def save_watermark(conn, name, ts):
+    conn.execute(text(f"""
+    INSERT INTO {WATERMARK_TABLE} (name, watermark) VALUES (:name, :ts)
+    ON CONFLICT (name) DO UPDATE SET watermark = EXCLUDED.watermark
+    """), {"name": name, "ts": ts})
+
+def read_prd_changes(since=None):
+    """All PRD rows, or every row (changed or not) of the orders with a row modified after `since`."""
+    if since is None:
+        return read_table(PRD_SCHEMA, "prd_orders")
+    prd = f'{PRD_SCHEMA}."prd_orders"'
+    return pd.read_sql(text(f"""
+    SELECT * FROM {prd}
+    WHERE "Order ID" IN (SELECT "Order ID" FROM {prd} WHERE last_modified_at > :since)
+    """), engine, params={"since": since})
 
 def generate_dim_date(
     start_date="2018-01-01",
@@ -100,60 +240,235 @@ def generate_dim_date(
     return df
 
 # ============================
-# Main DW Load Pipeline
+# Fact Loads
 # ============================
-def main():
-    now = datetime.datetime.utcnow()
-    print(f"🚀 Starting DW load at {now} UTC")
+def load_fact_pandas(since):
+    """Fallback: extract the PRD rows of changed orders and resolve surrogate keys with pandas merges."""
+    df_prd = read_prd_changes(since)
+    if df_prd.empty:
+        print(f"✅ No PRD changes since {since}, fact table untouched")
+        return
+    new_watermark = df_prd["last_modified_at"].max()
 
-    # --- Load MDM Dimensions ---
-    cust_bk = ["Customer ID","Customer Name","Segment"]
-    prod_bk = ["Product ID","Product Name","Category","Sub-Category"]
-    geo_bk  = ["Country","City","State","Postal Code","Region"]
+    # Facts are rebuilt from all live rows of each changed order (highest Row ID wins);
+    # an order is deleted only once none of its PRD rows is live
+    is_deleted = (df_prd["changetype"] == "D") | df_prd["is_deleted"].fillna(False).astype(bool)
+    df_live = df_prd[~is_deleted].sort_values(["Order ID", "Row ID"])
+    delete_ids = set(df_prd["Order ID"]) - set(df_live["Order ID"])
+
+    # --- Join current DW Dimension rows (same keys as the pushdown joins) ---
+    df_fact = df_live.merge(read_current_dim("dim_customers", ["Customer ID"]),
+                            on=["Customer ID"], how="left").rename(columns={"surrogate_key":"customer_sk"})
 
-    df_mdm_cust = read_table(MDM_SCHEMA,"customers")[cust_bk]
-    df_mdm_prod = read_table(MDM_SCHEMA,"products")[prod_bk]
-    df_mdm_geo  = read_table(MDM_SCHEMA,"countries")[geo_bk]
+    df_fact = df_fact.merge(read_current_dim("dim_products", ["Product ID"]),
+                            on=["Product ID"], how="left").rename(columns={"surrogate_key":"product_sk"})
 
-    upsert_dim(df_mdm_cust,"dim_customers",cust_bk)
-    upsert_dim(df_mdm_prod,"dim_products",prod_bk)
-    upsert_dim(df_mdm_geo,"dim_countries",geo_bk)
+    df_fact = df_fact.merge(read_current_dim("dim_countries", GEO_BK),
+                            on=GEO_BK, how="left").rename(columns={"surrogate_key":"country_sk"})
 
-    # --- Load Date Dimension ---
-    df_date = generate_dim_date()
+    # Dates join on date_key (YYYYMMDD); dim_date.full_date is stored as text
+    date_keys = read_current_dim("dim_date", [], sk_col="date_key")["date_key"]
+    for prd_col, sk_col in [("Order Date", "order_date_sk"), ("Ship Date", "ship_date_sk")]:
+        keys = pd.to_numeric(pd.to_datetime(df_fact[prd_col]).dt.strftime("%Y%m%d")).astype("Int64")
+        df_fact[sk_col] = keys.where(keys.isin(date_keys))
+
+    # --- Fact Columns ---
+    df_final_fact = df_fact[FACT_COLS].copy()
+
+    # --- Apply deletes + upserts and advance the watermark atomically ---
+    with engine.begin() as conn:
+        deleted = delete_fact(conn, delete_ids, FACT_TABLE) if delete_ids else 0
+        if not df_final_fact.empty:
+            upsert_fact(conn, df_final_fact, FACT_TABLE)
+        if pd.notna(new_watermark):
+            save_watermark(conn, FACT_TABLE, new_watermark)
+
+    print(f"✅ Facts: {len(df_final_fact)} rows upserted, {deleted} deleted (pandas lookup)")
+
+def read_current_dim(table, keys, sk_col="surrogate_key"):
+    """Business keys + sk of the current (current_flag) rows of a DW dimension."""
+    cols = ", ".join(f'"{c}"' for c in keys + [sk_col])
+    return pd.read_sql(text(f'SELECT {cols} FROM {DW_SCHEMA}."{table}" WHERE current_flag'), engine)
+
+def dim_join(alias, table, keys):
+    on = " AND ".join(f'{alias}."{k}" = p."{k}"' for k in keys)
+    return f'LEFT JOIN {DW_SCHEMA}."{table}" {alias} ON {alias}.current_flag AND {on}'
+
+def date_join(alias, prd_col):
+    return (f'LEFT JOIN {DW_SCHEMA}."dim_date" {alias} ON {alias}.current_flag '
+            f'AND {alias}.date_key = to_char(p."{prd_col}", \'YYYYMMDD\')::int')
+
+def load_fact_pushdown(since):
+    """Resolve surrogate keys with joins inside Postgres (INSERT INTO fact ... SELECT ... JOIN dim)."""
+    prd = f'{PRD_SCHEMA}."prd_orders"'
+    fact = f'{DW_SCHEMA}."{FACT_TABLE}"'
+    window = "w.last_modified_at <= :until" + ("" if since is None else " AND w.last_modified_at > :since")
+    changed_orders = f'SELECT w."Order ID" FROM {prd} w WHERE {window}'
+    is_live = "(p.changetype IS DISTINCT FROM 'D' AND p.is_deleted IS NOT TRUE)"
+
+    with engine.begin() as conn:
+        until = conn.execute(text(f"SELECT MAX(last_modified_at) FROM {prd}")).scalar()
+        if until is None or (since is not None and until <= since):
+            print(f"✅ No PRD changes since {since}, fact table untouched")
+            return
+        params = {"since": since, "until": until}
+
+        # Changed orders without any live PRD row left (inside or outside the window)
+        deleted = conn.execute(text(f"""
+        DELETE FROM {fact} f
+        WHERE f."Order ID" IN ({changed_orders})
+          AND NOT EXISTS (SELECT 1 FROM {prd} p WHERE p."Order ID" = f."Order ID" AND {is_live})
+        """), params).rowcount
+
+        # Changed orders rebuilt from all their live PRD rows, one per Order ID (highest Row ID),
+        # keys from current dimension rows
+        upserted = conn.execute(text(f"""
+        INSERT INTO {fact} ({", ".join(f'"{c}"' for c in FACT_COLS)})
+        SELECT DISTINCT ON (p."Order ID")
+            p."Order ID", od.date_key, sd.date_key,
+            c.surrogate_key, pr.surrogate_key, g.surrogate_key,
+            p."Sales", p."Quantity", p."Discount", p."Profit", p."Ship Mode"
+        FROM {prd} p
+        {dim_join("c", "dim_customers", ["Customer ID"])}
+        {dim_join("pr", "dim_products", ["Product ID"])}
+        {dim_join("g", "dim_countries", GEO_BK)}
+        {date_join("od", "Order Date")}
+        {date_join("sd", "Ship Date")}
+        WHERE p."Order ID" IN ({changed_orders}) AND {is_live}
+        ORDER BY p."Order ID", p."Row ID" DESC
+        ON CONFLICT ("Order ID") DO UPDATE SET
+            {", ".join(f'"{c}" = EXCLUDED."{c}"' for c in FACT_COLS if c != "Order ID")}
+        """), params).rowcount
+
+        save_watermark(conn, FACT_TABLE, until)
+
+    print(f"✅ Facts: {upserted} rows upserted, {deleted} deleted (pushdown lookup)")
+
+# ============================
+# Date Dimension Maintenance
+# ============================
+def load_dim_date_state():
+    """Range and calendar settings dim_date was last materialized with (None if never)."""
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {DIM_DATE_STATE_TABLE} (
+            name VARCHAR PRIMARY KEY, start_date DATE, end_date DATE,
+            fiscal_year_start_month INT, holidays TEXT)
+        """))
+        row = conn.execute(text(f"SELECT * FROM {DIM_DATE_STATE_TABLE} WHERE name = 'dim_date'")).mappings().first()
+    return dict(row) if row else None
+
+def save_dim_date_state(start, end, holidays):
+    with engine.begin() as conn:
+        conn.execute(text(f"""
+        INSERT INTO {DIM_DATE_STATE_TABLE} (name, start_date, end_date, fiscal_year_start_month, holidays)
+        VALUES ('dim_date', :start, :end, :fiscal, :holidays)
+        ON CONFLICT (name) DO UPDATE SET start_date = EXCLUDED.start_date, end_date = EXCLUDED.end_date,
+            fiscal_year_start_month = EXCLUDED.fiscal_year_start_month, holidays = EXCLUDED.holidays
+        """), {"start": start.date(), "end": end.date(), "fiscal": FISCAL_YEAR_START_MONTH,
+               "holidays": json.dumps(holidays)})
+
+def fact_date_range(since=None):
+    """Earliest/latest Order or Ship Date among PRD rows changed after `since` (all rows if None)."""
+    where = "" if since is None else "WHERE last_modified_at > :since"
+    with engine.connect() as conn:
+        lo, hi = conn.execute(text(f"""
+        SELECT MIN(LEAST("Order Date", "Ship Date"))::date, MAX(GREATEST("Order Date", "Ship Date"))::date
+        FROM {PRD_SCHEMA}."prd_orders" {where}
+        """), {"since": since}).one()
+    return (None if lo is None else pd.Timestamp(lo)), (None if hi is None else pd.Timestamp(hi))
+
+def write_dim_date(df_date):
+    """Insert new dates and overwrite refreshed ones in place (ON CONFLICT on date_key).
+
+    A date's calendar attributes carry no history, so dim_date keeps one (current) row
+    per date_key instead of SCD2 versions.
+    """
+    df_date = df_date.copy()
     df_date["full_date"] = df_date["full_date"].dt.strftime("%d-%m-%Y")
-    upsert_dim(df_date,"dim_date",["date_key"])
+    df_date["hash_key"] = hash_frame(df_date, list(df_date.columns), mode=HASH_MODE, na_as_null=False)
+    df_date["effective_from"] = datetime.datetime.utcnow()
+    df_date["effective_to"] = pd.NaT
+    df_date["current_flag"] = True
+    df_date["source_info"] = f"{MDM_SCHEMA}.dim_date"
+    with engine.begin() as conn:
+        upsert_fact(conn, df_date, "dim_date", ["date_key"])
+    print(f"[✓] dim_date: {len(df_date)} dates written")
 
-    # --- Load PRD Orders ---
-    df_prd = read_table(PRD_SCHEMA,"prd_orders")
+def sync_dim_date(since=None):
+    """Materialize dim_date once, then only extend it or refresh dates whose calendar changed."""
+    holidays = sorted(str(d.date()) for d in pd.to_datetime(HOLIDAYS))
+    lo, hi = fact_date_range(since)
+    today = pd.Timestamp(datetime.date.today())
+    start = min(pd.Timestamp(DIM_DATE_START), lo or today)
+    end = max(pd.Timestamp(DIM_DATE_MIN_END), hi or today, today) + pd.offsets.YearEnd(0)
 
-    # --- Join DW Dimensions ---
-    df_fact = df_prd.merge(read_table(DW_SCHEMA,"dim_customers")[cust_bk+["surrogate_key"]],
-                            on=cust_bk, how="left").rename(columns={"surrogate_key":"customer_sk"})
+    def calendar(first, last):
+        return generate_dim_date(first, last, FISCAL_YEAR_START_MONTH, holidays)
 
-    df_fact = df_fact.merge(read_table(DW_SCHEMA,"dim_products")[prod_bk+["surrogate_key"]],
-                            on=prod_bk, how="left").rename(columns={"surrogate_key":"product_sk"})
+    state = load_dim_date_state()
+    if state is None or state["fiscal_year_start_month"] != FISCAL_YEAR_START_MONTH:
+        if state is not None:
+            start, end = min(start, pd.Timestamp(state["start_date"])), max(end, pd.Timestamp(state["end_date"]))
+        print(f"📅 dim_date: full build {start.date()} → {end.date()}")
+        parts = [calendar(start, end)]
+    else:
+        cur_start, cur_end = pd.Timestamp(state["start_date"]), pd.Timestamp(state["end_date"])
+        start, end = min(start, cur_start), max(end, cur_end)
+        parts = []
+        if start < cur_start:
+            parts.append(calendar(start, cur_start - pd.Timedelta(days=1)))
+        if end > cur_end:
+            parts.append(calendar(cur_end + pd.Timedelta(days=1), end))
+        changed = pd.to_datetime(sorted(set(holidays) ^ set(json.loads(state["holidays"] or "[]"))))
+        changed = changed[(changed >= cur_start) & (changed <= cur_end)]
+        if len(changed):
+            parts.append(calendar(changed.min(), changed.max()).loc[lambda d: d["full_date"].isin(changed)])
+        if not parts:
+            print(f"[✓] dim_date: {cur_start.date()} → {cur_end.date()} already covers the facts, skipped")
+            return
+        print(f"📅 dim_date: {sum(len(p) for p in parts)} dates to add/refresh ({len(changed)} holiday changes)")
 
-    df_fact = df_fact.merge(read_table(DW_SCHEMA,"dim_countries")[geo_bk+["surrogate_key"]],
-                            on=geo_bk, how="left").rename(columns={"surrogate_key":"country_sk"})
+    write_dim_date(pd.concat(parts, ignore_index=True))
+    save_dim_date_state(start, end, holidays)
 
-    df_fact = df_fact.merge(read_table(DW_SCHEMA,"dim_date")[["date_key","full_date"]],
-                            left_on="Order Date", right_on="full_date", how="left").rename(columns={"date_key":"order_date_sk"})
-    df_fact.drop(columns=["full_date"], inplace=True)
+# ============================
+# Main DW Load Pipeline
+# ============================
+def main(full=False):
+    now = datetime.datetime.utcnow()
+    print(f"🚀 Starting DW load at {now} UTC ({'full rebuild' if full else 'incremental'})")
 
-    df_fact = df_fact.merge(read_table(DW_SCHEMA,"dim_date")[["date_key","full_date"]],
-                            left_on="Ship Date", right_on="full_date", how="left").rename(columns={"date_key":"ship_date_sk"})
-    df_fact.drop(columns=["full_date"], inplace=True)
+    # --- Load MDM Dimensions ---
+    df_mdm_cust = read_table(MDM_SCHEMA,"customers")[CUST_BK]
+    df_mdm_prod = read_table(MDM_SCHEMA,"products")[PROD_BK]
+    df_mdm_geo  = read_table(MDM_SCHEMA,"countries")[GEO_BK]
 
-    # --- Fact Columns ---
-    fact_cols = ["Order ID","order_date_sk","ship_date_sk","customer_sk","product_sk","country_sk",
-                 "Sales","Quantity","Discount","Profit","Ship Mode"]
-    df_final_fact = df_fact[fact_cols].copy()
+    # One current row per business key (replaces unique keys that reject new versions)
+    ensure_current_key_index("dim_customers", ["Customer ID"])
+    ensure_current_key_index("dim_products", ["Product ID"])
+    ensure_current_key_index("dim_countries", GEO_BK)
+
+    # Entity ID is the business key; hashing the full attribute list keeps existing hash_key values valid
+    upsert_dim(df_mdm_cust,"dim_customers",["Customer ID"],hash_cols=CUST_BK)
+    upsert_dim(df_mdm_prod,"dim_products",["Product ID"],hash_cols=PROD_BK)
+    upsert_dim(df_mdm_geo,"dim_countries",GEO_BK)
+
+    since = None if full else load_watermark(FACT_TABLE)
+
+    # --- Date Dimension (extended/refreshed only when needed) ---
+    sync_dim_date(since)
 
-    # --- Upsert Fact Table ---
-    upsert_fact(df_final_fact,"fact_orders_sales")
+    # --- Load Facts (PRD changes since the last fact load unless full) ---
+    if FACT_LOOKUP_MODE == "pushdown":
+        load_fact_pushdown(since)
+    else:
+        load_fact_pandas(since)
 
-    print(f"✅ DW load completed with {len(df_final_fact)} fact rows at {datetime.datetime.utcnow()} UTC")
+    print(f"✅ DW load completed at {datetime.datetime.utcnow()} UTC")
 
 if __name__=="__main__":
-    main()
+    arg_parser = argparse.ArgumentParser(description="Load DW dimensions and facts from MDM/PRD.")
+    arg_parser.add_argument("--full", action="store_true",
+                            help="reprocess every PRD order (backfill) instead of changes since the last load")
+    main(full=arg_parser.parse_args().full)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+# ==============================
+# === GOLDEN RECORD ENGINE ====
+# ==============================
+# Set-at-a-time consolidation used by mdm.consolidate_entity: scores every
+# incoming row at once, picks one winner per key and applies the result to
+# the golden set in a single filter + concat.
+
+def join_per_key(keys, values, sep=","):
+    """sep-joined values per key, in order of appearance (one stable sort instead of a per-group agg)."""
+    codes, uniques = pd.factorize(keys)
+    order = np.argsort(codes, kind="stable")
+    parts = np.split(values.to_numpy(dtype=object)[order], np.flatnonzero(np.diff(codes[order])) + 1)
+    return pd.Series([sep.join(p) for p in parts] if len(order) else [], index=uniques, dtype=object)
+
+def build_golden_records(df_inc, key_col, important_fields):
+    """Vectorized golden-record selection over all keys at once.
+
+    Per key the last incoming row decides delete vs upsert; for upserts the row with the
+    most non-blank important fields wins (first such row on ties). Returns (golden, delete_keys).
+    """
+    df_inc = df_inc[df_inc[key_col].notna()].reset_index(drop=True)
+
+    last = df_inc.drop_duplicates(key_col, keep="last")
+    is_deleted = last["is_deleted"].fillna(False).astype(bool)
+    deleted = (last["changetype"] == "D") | is_deleted
+    delete_keys = last.loc[deleted, key_col]
+
+    df_up = df_inc[~df_inc[key_col].isin(delete_keys)]
+    fields = df_up[important_fields].fillna("")
+    score = sum(fields[f].astype(str).str.strip().ne("").astype(int) for f in important_fields)
+
+    best_idx = score.groupby(df_up[key_col], sort=False).idxmax()
+    golden = fields.loc[best_idx.values].copy()
+    golden.insert(0, key_col, df_up.loc[best_idx.values, key_col].values)
+
+    # Row IDs per key, de-duplicated in order of appearance
+    rids = pd.DataFrame({key_col: df_up[key_col], "rid": df_up["Row ID"].astype(str)}).drop_duplicates()
+    source_list = join_per_key(rids[key_col], rids["rid"])
+
+    golden["source_list"] = golden[key_col].map(source_list).values
+    golden["golden_score"] = score.loc[best_idx.values].values
+    golden["last_updated"] = datetime.utcnow().isoformat()
+    return golden.reset_index(drop=True), delete_keys
+
+def apply_golden_changes(df_existing, golden, delete_keys, key_col):
+    """Drop deleted and re-consolidated keys from the golden set, then append the new versions."""
+    touched = pd.Index(delete_keys).append(pd.Index(golden[key_col]))
+    df_existing = df_existing[~df_existing[key_col].isin(touched)]
+    return pd.concat([df_existing, golden], ignore_index=True)
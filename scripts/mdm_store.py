@@ -0,0 +1,163 @@
+import os
+import glob
+from abc import ABC, abstractmethod
+import pandas as pd
+from sqlalchemy import text
+from pg_copy import copy_frame, quote_ident
+from mdm_consolidation import apply_golden_changes
+
+# ==============================
+# === MDM GOLDEN STORES =======
+# ==============================
+# Where mdm.consolidate_entity keeps the golden records of one entity.
+#   csv      <mdm>/<entity>.csv, read and rewritten whole (original layout)
+#   parquet  <mdm>/<entity>/bucket=NN.parquet, keys hash-bucketed; only buckets
+#            holding changed or deleted keys are rewritten
+#   postgres mdm."<entity>" with the business key as primary key; changes are
+#            applied with DELETE + COPY + INSERT ... ON CONFLICT, so
+#            load_dw.read_table(MDM_SCHEMA, entity) reads it directly
+
+MDM_STORE_BACKENDS = ("csv", "parquet", "postgres")
+GOLDEN_META = ["source_list", "golden_score", "last_updated"]
+PARQUET_BUCKETS = 64
+
+
+class GoldenStore(ABC):
+    def __init__(self, entity, key_col, fields):
+        self.entity = entity
+        self.key_col = key_col
+        self.fields = list(fields)
+        self.sk_col = f"{entity[:-1]}_sk"
+        self.columns = [self.sk_col, key_col] + self.fields + GOLDEN_META
+
+    def empty(self):
+        return pd.DataFrame(columns=self.columns)
+
+    def ensure(self):
+        """Create the store's tables up front; called once per run, before concurrent use."""
+
+    @abstractmethod
+    def read(self, columns=None):
+        """All golden records (optionally only `columns`)."""
+
+    @abstractmethod
+    def apply(self, golden, delete_keys):
+        """Upsert golden rows (already carrying their sk from sk_registry) and remove delete_keys."""
+
+
+class CsvGoldenStore(GoldenStore):
+    def __init__(self, entity, key_col, fields, path):
+        super().__init__(entity, key_col, fields)
+        self.path = path
+
+    def __str__(self):
+        return self.path
+
+    def read(self, columns=None):
+        if not os.path.exists(self.path):
+            return self.empty()[columns or self.columns]
+        return pd.read_csv(self.path, usecols=columns)
+
+    def apply(self, golden, delete_keys):
+        df = apply_golden_changes(self.read(), golden, delete_keys, self.key_col)
+        df[self.columns].sort_values(self.key_col).to_csv(self.path, index=False)
+
+
+class ParquetGoldenStore(GoldenStore):
+    def __init__(self, entity, key_col, fields, folder, buckets=PARQUET_BUCKETS):
+        super().__init__(entity, key_col, fields)
+        self.folder = folder
+        self.buckets = buckets
+
+    def __str__(self):
+        return self.folder
+
+    def bucket_path(self, bucket):
+        return os.path.join(self.folder, f"bucket={bucket:02d}.parquet")
+
+    def bucket_of(self, keys):
+        keys = pd.Series(pd.Index(keys).astype(str))
+        return (pd.util.hash_pandas_object(keys, index=False) % self.buckets).astype(int).to_numpy()
+
+    def read(self, columns=None, buckets=None):
+        paths = sorted(glob.glob(os.path.join(self.folder, "bucket=*.parquet")))
+        if buckets is not None:
+            paths = [p for p in paths if p in {self.bucket_path(b) for b in buckets}]
+        if not paths:
+            return self.empty()[columns or self.columns]
+        return pd.concat([pd.read_parquet(p, columns=columns) for p in paths], ignore_index=True)
+
+    def apply(self, golden, delete_keys):
+        os.makedirs(self.folder, exist_ok=True)
+        golden = golden.assign(_bucket=self.bucket_of(golden[self.key_col]))
+        deletes = pd.DataFrame({self.key_col: pd.Index(delete_keys)})
+        deletes["_bucket"] = self.bucket_of(deletes[self.key_col])
+
+        for bucket in sorted(set(golden["_bucket"]) | set(deletes["_bucket"])):
+            path = self.bucket_path(bucket)
+            existing = pd.read_parquet(path) if os.path.exists(path) else self.empty()
+            df = apply_golden_changes(existing,
+                                      golden.loc[golden["_bucket"] == bucket, self.columns],
+                                      deletes.loc[deletes["_bucket"] == bucket, self.key_col],
+                                      self.key_col)
+            if df.empty:
+                if os.path.exists(path):
+                    os.remove(path)
+                continue
+            tmp_path = os.path.join(self.folder, f".bucket={bucket:02d}.parquet.tmp")
+            df[self.columns].sort_values(self.key_col).astype({self.sk_col: "int64"}).to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+
+
+class PostgresGoldenStore(GoldenStore):
+    def __init__(self, entity, key_col, fields, engine, schema="mdm"):
+        super().__init__(entity, key_col, fields)
+        self.engine = engine
+        self.schema = schema
+        self.table = f"{schema}.{quote_ident(entity)}"
+
+    def __str__(self):
+        return self.table
+
+    def ensure(self):
+        cols = ", ".join([f"{quote_ident(self.sk_col)} BIGINT",
+                          f"{quote_ident(self.key_col)} TEXT PRIMARY KEY"]
+                         + [f"{quote_ident(c)} TEXT" for c in self.fields]
+                         + ["source_list TEXT", "golden_score INTEGER", "last_updated TEXT"])
+        with self.engine.begin() as conn:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self.schema}"))
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {self.table} ({cols})"))
+
+    def read(self, columns=None):
+        cols = ", ".join(quote_ident(c) for c in (columns or self.columns))
+        with self.engine.begin() as conn:
+            return pd.read_sql(text(f"SELECT {cols} FROM {self.table}"), conn)
+
+    def apply(self, golden, delete_keys):
+        key = quote_ident(self.key_col)
+        cols = ", ".join(quote_ident(c) for c in self.columns)
+        updates = ", ".join(f"{quote_ident(c)} = EXCLUDED.{quote_ident(c)}" for c in self.columns if c != self.key_col)
+        with self.engine.begin() as conn:
+            if len(delete_keys):
+                conn.execute(text(f"DELETE FROM {self.table} WHERE {key} = ANY(:keys)"),
+                             {"keys": [str(k) for k in delete_keys]})
+            if golden.empty:
+                return
+            conn.execute(text(f"CREATE TEMP TABLE tmp_mdm_golden (LIKE {self.table}) ON COMMIT DROP"))
+            copy_frame(conn, "tmp_mdm_golden", golden[self.columns])
+            conn.execute(text(f"""
+                INSERT INTO {self.table} ({cols})
+                SELECT {cols} FROM tmp_mdm_golden
+                ON CONFLICT ({key}) DO UPDATE SET {updates}
+            """))
+
+
+def golden_store(backend, entity, key_col, fields, output_dir, engine=None):
+    """Golden-record store of one entity for the configured backend."""
+    if backend not in MDM_STORE_BACKENDS:
+        raise ValueError(f"Unknown MDM store backend {backend!r}, expected one of {MDM_STORE_BACKENDS}")
+    if backend == "postgres":
+        return PostgresGoldenStore(entity, key_col, fields, engine)
+    if backend == "parquet":
+        return ParquetGoldenStore(entity, key_col, fields, os.path.join(output_dir, entity))
+    return CsvGoldenStore(entity, key_col, fields, os.path.join(output_dir, f"{entity}.csv"))
@@ -0,0 +1,83 @@
+import os
+import glob
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# ==============================
+# === PARQUET DATASETS ========
+# ==============================
+# Typed, hive-partitioned copies of stg/prd orders:
+#   <root>/sourcemonthyear_key=012024/<part>.parquet
+# Parts are written as hidden ".<part>.parquet.tmp" files (ignored by readers)
+# and published with os.replace once the matching Postgres transaction commits.
+# The partition key is read back as a string so "012024" keeps its leading zero.
+
+PARTITION_COL = "sourcemonthyear_key"
+DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+PARTITIONING = ds.partitioning(pa.schema([(PARTITION_COL, pa.string())]), flavor="hive")
+
+
+def partition_dir(root, value):
+    value = DEFAULT_PARTITION if value is None or pd.isna(value) else value
+    return os.path.join(root, f"{PARTITION_COL}={value}")
+
+
+def write_part(df, root, partition_value, name):
+    """Write df as a pending part of one partition; returns (tmp_path, final_path) for publish_parts."""
+    folder = partition_dir(root, partition_value)
+    os.makedirs(folder, exist_ok=True)
+    final_path = os.path.join(folder, f"{name}.parquet")
+    tmp_path = os.path.join(folder, f".{name}.parquet.tmp")
+
+    df = df.drop(columns=[PARTITION_COL], errors="ignore")
+    # Plain strings keep part schemas identical across files (parquet dictionary-encodes them anyway)
+    categories = df.select_dtypes("category").columns
+    if len(categories):
+        df = df.astype({c: "string" for c in categories})
+    df.to_parquet(tmp_path, index=False)
+    return tmp_path, final_path
+
+
+def publish_parts(parts, replace_partition=False):
+    """Move pending parts into place; replace_partition drops the partition's other parts first."""
+    for tmp_path, final_path in parts:
+        if replace_partition:
+            for old in glob.glob(os.path.join(os.path.dirname(final_path), "*.parquet")):
+                if old != final_path:
+                    os.remove(old)
+        os.replace(tmp_path, final_path)
+
+
+def discard_parts(parts):
+    for tmp_path, _ in parts:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def open_dataset(root):
+    return ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+
+
+def dataset_columns(root):
+    """Column names of a dataset (partition key included), [] if it does not exist yet."""
+    return open_dataset(root).schema.names if os.path.isdir(root) else []
+
+
+def read_dataset(root, columns=None, filters=None, partitions=None):
+    """Read a dataset with column projection and predicate/partition pruning.
+
+    filters use pyarrow's DNF tuples, e.g. [("last_modified_at", ">", ts)];
+    partitions restricts the scan to the given sourcemonthyear_key values.
+    """
+    if not os.path.isdir(root):
+        return pd.DataFrame(columns=columns or [])
+    dataset = open_dataset(root)
+    filters = list(filters or [])
+    if partitions is not None:
+        filters.append((PARTITION_COL, "in", [str(p) for p in partitions]))
+    if columns is not None:
+        columns = [c for c in columns if c in dataset.schema.names]
+    expression = pq.filters_to_expression(filters) if filters else None
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
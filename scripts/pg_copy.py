@@ -0,0 +1,67 @@
+import csv
+import io
+from sqlalchemy import text
+
+# ==============================
+# === POSTGRES COPY WRITER ====
+# ==============================
+# pandas' default to_sql path issues INSERT statements; for Postgres we stream
+# each chunk through COPY ... FROM STDIN from an in-memory CSV buffer instead.
+
+COPY_NULL = "\\N"
+DEFAULT_CHUNK_ROWS = 100000
+
+
+def quote_ident(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def supports_copy(con):
+    """True when the engine/connection is Postgres over psycopg2 (copy_expert available)."""
+    dialect = getattr(con, "dialect", None)
+    return dialect is not None and dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def copy_rows(dbapi_conn, target, columns, rows):
+    """Stream an iterable of row tuples into target with COPY FROM STDIN."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow([COPY_NULL if v is None else v for v in row])
+    buf.seek(0)
+
+    cols = ", ".join(quote_ident(c) for c in columns)
+    with dbapi_conn.cursor() as cur:
+        cur.copy_expert(f"COPY {target} ({cols}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')", buf)
+
+
+def psql_insert_copy(table, conn, keys, data_iter):
+    """`method=` callable for DataFrame.to_sql that loads one chunk with COPY FROM STDIN."""
+    target = quote_ident(table.name)
+    if table.schema:
+        target = f"{quote_ident(table.schema)}.{target}"
+    copy_rows(conn.connection, target, keys, data_iter)
+
+
+def copy_frame(conn, target, df, use_copy=True):
+    """Load df into an existing (e.g. temporary) table on an open SQLAlchemy connection."""
+    df = df.astype(object).where(df.notna(), None)
+    if use_copy and supports_copy(conn):
+        copy_rows(conn.connection, target, df.columns, df.itertuples(index=False, name=None))
+        return "copy"
+
+    params = [f"p{i}" for i in range(len(df.columns))]
+    sql = text(f"INSERT INTO {target} ({', '.join(quote_ident(c) for c in df.columns)}) "
+               f"VALUES ({', '.join(':' + p for p in params)})")
+    records = [dict(zip(params, row)) for row in df.itertuples(index=False, name=None)]
+    if records:
+        conn.execute(sql, records)
+    return "insert"
+
+
+def write_df(df, table, con, schema=None, chunk_rows=DEFAULT_CHUNK_ROWS, use_copy=True):
+    """Append df to table, using COPY when available and plain to_sql otherwise."""
+    method = psql_insert_copy if use_copy and supports_copy(con) else None
+    df.to_sql(table, con, schema=schema, if_exists="append", index=False,
+              chunksize=chunk_rows, method=method)
+    return "copy" if method is not None else "insert"
@@ -0,0 +1,77 @@
+import hashlib
+import numpy as np
+import pandas as pd
+
+# ==============================
+# === VECTORIZED ROW HASHING ==
+# ==============================
+# Column-wise equivalent of the per-row helper previously used in
+# load_to_stg_prd.py / load_dw.py:
+#   vals = ["<NULL>" if null or str(v).strip() == "" else str(v).strip().upper() for v in row]
+#   sha256("||".join(vals).encode("utf-8")).hexdigest()
+# "sha256" output is byte-for-byte identical to that helper. The "fast64" /
+# "fast128" modes use pandas' vectorized 64-bit hashing and are NOT compatible
+# with existing sha256 hash_key values (switching mode re-flags every row).
+
+NULL_SENTINEL = "<NULL>"
+SEPARATOR = "||"
+HASH_MODES = ("sha256", "fast64", "fast128")
+
+# hash_pandas_object takes a 16-character key; two keys give 128 bits
+_FAST_KEY_LO = "rowhash-fast-lo!"
+_FAST_KEY_HI = "rowhash-fast-hi!"
+
+
+def normalize_column(col, na_as_null=True):
+    """str/strip/upper a column, replacing nulls and blanks with the NULL sentinel.
+
+    na_as_null=True treats None/NaN/NaT/pd.NA as null (load_to_stg_prd semantics);
+    na_as_null=False only treats None as null, so NaN hashes as "NAN" (load_dw semantics).
+    """
+    obj = col.astype(object)
+    if na_as_null:
+        is_null = obj.isna().to_numpy()
+    else:
+        is_null = np.fromiter((v is None for v in obj), dtype=bool, count=len(obj))
+
+    # Python's str.strip()/upper() on object dtype, as the legacy helper did: the
+    # Arrow-backed str dtype (pandas 3) case-maps differently (e.g. "ß" → "ẞ", not "SS")
+    if pd.api.types.is_datetime64_any_dtype(col):
+        # str(Timestamp) is slow; format each distinct value once
+        codes, uniques = pd.factorize(col, use_na_sentinel=False)
+        labels = np.array([str(v).strip() for v in uniques.astype(object)], dtype=object)
+        text = labels[codes]
+    else:
+        text = np.array([str(v).strip() for v in obj], dtype=object)
+    is_null = is_null | (text == "")
+    upper = np.array([v.upper() for v in text], dtype=object)
+    return pd.Series(np.where(is_null, NULL_SENTINEL, upper), index=col.index, dtype=object)
+
+
+def row_payloads(df, columns=None, na_as_null=True):
+    """The "||"-joined normalized string each row is hashed from."""
+    columns = list(df.columns) if columns is None else list(columns)
+    if not columns:
+        return pd.Series("", index=df.index, dtype=object)
+    normalized = [normalize_column(df[c], na_as_null) for c in columns]
+    if len(normalized) == 1:
+        return normalized[0]
+    return normalized[0].str.cat(normalized[1:], sep=SEPARATOR)
+
+
+def hash_frame(df, columns=None, mode="sha256", na_as_null=True):
+    """Hex digest per row of df[columns]; returns a Series aligned with df.index."""
+    if mode not in HASH_MODES:
+        raise ValueError(f"Unknown hash mode {mode!r}, expected one of {HASH_MODES}")
+
+    payloads = row_payloads(df, columns, na_as_null)
+    if mode == "sha256":
+        digests = [hashlib.sha256(p.encode("utf-8")).hexdigest() for p in payloads]
+        return pd.Series(digests, index=df.index, dtype=object)
+
+    lo = pd.util.hash_pandas_object(payloads, index=False, hash_key=_FAST_KEY_LO).to_numpy()
+    digests = pd.Series(lo).map("{:016x}".format)
+    if mode == "fast128":
+        hi = pd.util.hash_pandas_object(payloads, index=False, hash_key=_FAST_KEY_HI).to_numpy()
+        digests = pd.Series(hi).map("{:016x}".format) + digests
+    return pd.Series(digests.to_numpy(), index=df.index, dtype=object)
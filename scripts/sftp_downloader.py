@@ -0,0 +1,164 @@
+import os
+import json
+import stat
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import paramiko
+
+# ==============================
+# === SFTP DOWNLOADER =========
+# ==============================
+# Parallel, resumable download of a remote folder:
+#   * N worker threads, each with its own SFTP session
+#   * local manifest {filename: {size, mtime}} so unchanged files are skipped
+#   * transfers land in "<file>.part" and resume from the partial's byte offset
+#     when the remote file still has the same size/mtime
+
+MANIFEST_NAME = ".sftp_manifest.json"
+PART_SUFFIX = ".part"
+CHUNK_BYTES = 1024 * 1024
+
+
+def open_sftp(host, port, username, password):
+    """Open one SFTP session (no host key verification, as in the original pysftp setup)."""
+    transport = paramiko.Transport((host, port))
+    transport.connect(username=username, password=password)
+    return paramiko.SFTPClient.from_transport(transport)
+
+
+def close_sftp(sftp):
+    transport = sftp.get_channel().get_transport()
+    sftp.close()
+    transport.close()
+
+# ==============================
+# === MANIFEST ================
+# ==============================
+def load_manifest(local_dir):
+    path = os.path.join(local_dir, MANIFEST_NAME)
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(local_dir, manifest):
+    path = os.path.join(local_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def remote_signature(attr):
+    return {"size": attr.st_size, "mtime": int(attr.st_mtime)}
+
+
+def needs_download(attr, manifest, local_dir):
+    entry = manifest.get(attr.filename)
+    local_path = os.path.join(local_dir, attr.filename)
+    return entry != remote_signature(attr) or not os.path.exists(local_path)
+
+# ==============================
+# === TRANSFER ================
+# ==============================
+def resume_offset(part_path, signature):
+    """Byte offset to resume from; 0 unless the partial belongs to the same remote version."""
+    sidecar = part_path + ".json"
+    if not os.path.exists(part_path) or not os.path.exists(sidecar):
+        return 0
+    with open(sidecar, "r") as f:
+        if json.load(f) != signature:
+            return 0
+    offset = os.path.getsize(part_path)
+    return offset if offset <= signature["size"] else 0
+
+
+def download_file(sftp, remote_path, local_path, signature, chunk_bytes=CHUNK_BYTES):
+    """Download one file via "<local>.part", resuming a matching partial. Returns bytes fetched."""
+    part_path = local_path + PART_SUFFIX
+    offset = resume_offset(part_path, signature)
+    if offset == 0:
+        with open(part_path + ".json", "w") as f:
+            json.dump(signature, f)
+
+    fetched = 0
+    with sftp.open(remote_path, "rb") as rf, open(part_path, "ab" if offset else "wb") as lf:
+        rf.seek(offset)
+        rf.prefetch(signature["size"])
+        while True:
+            block = rf.read(chunk_bytes)
+            if not block:
+                break
+            lf.write(block)
+            fetched += len(block)
+
+    if os.path.getsize(part_path) != signature["size"]:
+        raise IOError(f"Incomplete transfer for {remote_path}: {os.path.getsize(part_path)} of {signature['size']} bytes")
+
+    os.replace(part_path, local_path)
+    os.remove(part_path + ".json")
+    os.utime(local_path, (signature["mtime"], signature["mtime"]))
+    return fetched
+
+
+def download_new_files(connect, remote_dir, local_dir, workers=4, chunk_bytes=CHUNK_BYTES):
+    """Fetch new/changed files from remote_dir with a pool of `workers` SFTP sessions.
+
+    `connect` is a zero-argument callable returning a paramiko SFTPClient.
+    Returns {"downloaded": [...], "skipped": [...], "failed": {...}, "bytes": int}.
+    """
+    os.makedirs(local_dir, exist_ok=True)
+    manifest = load_manifest(local_dir)
+
+    lister = connect()
+    try:
+        remote_files = [a for a in lister.listdir_attr(remote_dir) if stat.S_ISREG(a.st_mode or 0)]
+    finally:
+        close_sftp(lister)
+
+    todo = [a for a in remote_files if needs_download(a, manifest, local_dir)]
+    todo_names = {a.filename for a in todo}
+    result = {"downloaded": [], "skipped": sorted(a.filename for a in remote_files if a.filename not in todo_names),
+              "failed": {}, "bytes": 0}
+    if not todo:
+        return result
+
+    local = threading.local()
+    sessions, lock = [], threading.Lock()
+
+    def session():
+        if not hasattr(local, "sftp"):
+            local.sftp = connect()
+            with lock:
+                sessions.append(local.sftp)
+        return local.sftp
+
+    def fetch(attr):
+        signature = remote_signature(attr)
+        fetched = download_file(session(), posixpath.join(remote_dir, attr.filename),
+                                os.path.join(local_dir, attr.filename), signature, chunk_bytes)
+        with lock:
+            manifest[attr.filename] = signature
+            save_manifest(local_dir, manifest)
+        return fetched
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(todo)))) as pool:
+            futures = {pool.submit(fetch, a): a.filename for a in todo}
+            for fut in as_completed(futures):
+                fname = futures[fut]
+                try:
+                    result["bytes"] += fut.result()
+                    result["downloaded"].append(fname)
+                    print(f"Downloaded {fname}")
+                except Exception as e:
+                    result["failed"][fname] = str(e)
+                    print(f"[!] Failed to download {fname}: {e}")
+    finally:
+        for sftp in sessions:
+            close_sftp(sftp)
+
+    result["downloaded"].sort()
+    return result
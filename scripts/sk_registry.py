@@ -0,0 +1,222 @@
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from sqlalchemy import text
+from pg_copy import copy_frame
+
+# ==============================
+# === SURROGATE KEY REGISTRY ==
+# ==============================
+# Persistent business key → sk map per MDM entity. Keys are assigned once,
+# only to business keys never seen before, from a counter that only grows, so
+# a deleted key's sk is never handed to another key (and a key that comes
+# back gets its old sk). Lookups are vectorized over whole key columns.
+#   postgres  mdm.sk_registry (PRIMARY KEY (entity, business_key)) plus a
+#             per-entity counter row locked while keys are assigned
+#   arrow     <mdm>/_sk_registry/<entity>.arrow, an Arrow IPC file sorted by a
+#             64-bit key hash and memory-mapped for lookups (binary search on
+#             the hash column, then key comparison of the hits)
+
+SK_REGISTRY_BACKENDS = ("postgres", "arrow")
+
+
+def _unique_keys(keys):
+    return pd.Index(pd.Series(keys, dtype=object).astype(str)).unique()
+
+
+class PostgresKeyRegistry:
+    def __init__(self, entity, engine, schema="mdm"):
+        self.entity = entity
+        self.engine = engine
+        self.table = f"{schema}.sk_registry"
+        self.counter = f"{schema}.sk_registry_counter"
+        self.schema = schema
+
+    def __str__(self):
+        return f"{self.table} ({self.entity})"
+
+    def ensure(self):
+        """Create the registry tables and the entity's counter row; call once, before concurrent use."""
+        with self.engine.begin() as conn:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self.schema}"))
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    entity TEXT, business_key TEXT, sk BIGINT NOT NULL,
+                    assigned_at TIMESTAMP DEFAULT now(),
+                    PRIMARY KEY (entity, business_key))
+            """))
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {self.counter} (entity TEXT PRIMARY KEY, last_sk BIGINT NOT NULL)"))
+            conn.execute(text(f"INSERT INTO {self.counter} VALUES (:e, 0) ON CONFLICT (entity) DO NOTHING"),
+                         {"e": self.entity})
+
+    def _stage_keys(self, conn, keys):
+        conn.execute(text("CREATE TEMP TABLE tmp_sk_keys (business_key TEXT PRIMARY KEY) ON COMMIT DROP"))
+        copy_frame(conn, "tmp_sk_keys", pd.DataFrame({"business_key": keys}))
+
+    def _fetch(self, conn):
+        df = pd.read_sql(text(f"""
+            SELECT r.business_key, r.sk FROM {self.table} r
+            JOIN tmp_sk_keys t ON t.business_key = r.business_key
+            WHERE r.entity = :e
+        """), conn, params={"e": self.entity})
+        return pd.Series(df["sk"].values, index=df["business_key"].values)
+
+    def is_empty(self):
+        with self.engine.begin() as conn:
+            return not conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {self.table} WHERE entity = :e)"),
+                                    {"e": self.entity}).scalar()
+
+    def lookup(self, keys):
+        """sk per key (Int64, <NA> for keys never assigned), aligned with keys."""
+        keys = pd.Series(keys, dtype=object).astype(str)
+        with self.engine.begin() as conn:
+            self._stage_keys(conn, _unique_keys(keys))
+            found = self._fetch(conn)
+        return pd.Series(keys.map(found).values, index=keys.index, dtype="Int64")
+
+    def assign(self, keys):
+        """sk per key, registering keys never seen before with fresh sks."""
+        keys = pd.Series(keys, dtype=object).astype(str)
+        with self.engine.begin() as conn:
+            # Row lock on the entity's counter serializes concurrent assigners
+            last_sk = conn.execute(text(f"SELECT last_sk FROM {self.counter} WHERE entity = :e FOR UPDATE"),
+                                   {"e": self.entity}).scalar()
+            self._stage_keys(conn, _unique_keys(keys))
+            added = conn.execute(text(f"""
+                INSERT INTO {self.table} (entity, business_key, sk)
+                SELECT :e, t.business_key, :last_sk + ROW_NUMBER() OVER (ORDER BY t.business_key)
+                FROM tmp_sk_keys t
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM {self.table} r WHERE r.entity = :e AND r.business_key = t.business_key)
+            """), {"e": self.entity, "last_sk": last_sk}).rowcount
+            conn.execute(text(f"UPDATE {self.counter} SET last_sk = last_sk + :n WHERE entity = :e"),
+                         {"e": self.entity, "n": added})
+            found = self._fetch(conn)
+        return pd.Series(keys.map(found).values, index=keys.index, dtype="int64")
+
+    def seed(self, pairs, key_col, sk_col):
+        """Register existing (business key, sk) pairs, e.g. golden records mastered before the registry."""
+        pairs = pd.DataFrame({"entity": self.entity, "business_key": pairs[key_col].astype(str),
+                              "sk": pairs[sk_col].astype("int64")})
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE TEMP TABLE tmp_sk_seed (entity TEXT, business_key TEXT, sk BIGINT) ON COMMIT DROP"))
+            copy_frame(conn, "tmp_sk_seed", pairs)
+            conn.execute(text(f"""
+                INSERT INTO {self.table} (entity, business_key, sk)
+                SELECT entity, business_key, sk FROM tmp_sk_seed
+                ON CONFLICT (entity, business_key) DO NOTHING
+            """))
+            conn.execute(text(f"""
+                UPDATE {self.counter}
+                SET last_sk = GREATEST(last_sk, (SELECT COALESCE(MAX(sk), 0) FROM tmp_sk_seed))
+                WHERE entity = :e
+            """), {"e": self.entity})
+
+
+class ArrowKeyRegistry:
+    SCHEMA = pa.schema([("hash", pa.uint64()), ("business_key", pa.string()), ("sk", pa.int64())])
+
+    def __init__(self, entity, path):
+        self.entity = entity
+        self.path = path
+
+    def __str__(self):
+        return self.path
+
+    def ensure(self):
+        """Nothing to create up front: the file is written on first assign/seed."""
+
+    @staticmethod
+    def key_hashes(keys):
+        # categorize=False: registry keys are unique, factorizing first only costs time
+        return pd.util.hash_array(np.asarray(keys, dtype=object), categorize=False)
+
+    def _open(self):
+        """(hashes, business_keys, sks, last_sk), memory-mapped from the registry file."""
+        if not os.path.exists(self.path):
+            return np.empty(0, np.uint64), pa.array([], pa.string()), np.empty(0, np.int64), 0
+        table = pa.ipc.open_file(pa.memory_map(self.path, "r")).read_all()
+        last_sk = int(table.schema.metadata[b"last_sk"])
+        return (table.column("hash").to_numpy(), table.column("business_key").combine_chunks(),
+                table.column("sk").to_numpy(), last_sk)
+
+    def _positions(self, keys, hashes, stored_keys):
+        """Row of each key in the registry, -1 if absent."""
+        h = self.key_hashes(keys)
+        out = np.full(len(h), -1, dtype=np.int64)
+        if not len(hashes):
+            return out
+        pos = np.searchsorted(hashes, h)
+        hit_idx = np.flatnonzero(hashes[np.minimum(pos, len(hashes) - 1)] == h)
+        same = pc.equal(stored_keys.take(pa.array(pos[hit_idx])),
+                        pa.array(np.asarray(keys, dtype=object)[hit_idx], pa.string())).to_numpy(zero_copy_only=False)
+        out[hit_idx[same]] = pos[hit_idx[same]]
+        # Hash collisions (vanishingly rare): scan the run of equal hashes
+        for i in hit_idx[~same]:
+            hi = np.searchsorted(hashes, h[i], side="right")
+            for j in range(pos[i], hi):
+                if stored_keys[j].as_py() == keys[i]:
+                    out[i] = j
+                    break
+        return out
+
+    def is_empty(self):
+        return not os.path.exists(self.path)
+
+    def lookup(self, keys):
+        """sk per key (Int64, <NA> for keys never assigned), aligned with keys."""
+        keys = pd.Series(keys, dtype=object).astype(str)
+        hashes, stored_keys, sks, _ = self._open()
+        pos = self._positions(keys.to_numpy(), hashes, stored_keys)
+        out = pd.Series(pd.NA, index=keys.index, dtype="Int64")
+        out[pos >= 0] = sks[pos[pos >= 0]]
+        return out
+
+    def assign(self, keys):
+        """sk per key, registering keys never seen before with fresh sks."""
+        keys = pd.Series(keys, dtype=object).astype(str)
+        hashes, stored_keys, sks, last_sk = self._open()
+        pos = self._positions(keys.to_numpy(), hashes, stored_keys)
+        out = np.zeros(len(keys), dtype=np.int64)
+        out[pos >= 0] = sks[pos[pos >= 0]]
+        missing = pos < 0
+        if missing.any():
+            new = np.sort(keys[missing].unique().astype(object))
+            new_sks = np.arange(last_sk + 1, last_sk + 1 + len(new), dtype=np.int64)
+            self._write(np.concatenate([hashes, self.key_hashes(new)]),
+                        pa.concat_arrays([stored_keys, pa.array(new, pa.string())]),
+                        np.concatenate([sks, new_sks]), last_sk + len(new))
+            out[missing] = new_sks[np.searchsorted(new, keys[missing].to_numpy(dtype=object))]
+        return pd.Series(out, index=keys.index)
+
+    def seed(self, pairs, key_col, sk_col):
+        pairs = pairs.drop_duplicates(key_col)
+        keys = pairs[key_col].astype(str).to_numpy(dtype=object)
+        hashes, stored_keys, sks, last_sk = self._open()
+        fresh = self._positions(keys, hashes, stored_keys) < 0
+        seeded_sks = pairs[sk_col].astype("int64").to_numpy()
+        self._write(np.concatenate([hashes, self.key_hashes(keys[fresh])]),
+                    pa.concat_arrays([stored_keys, pa.array(keys[fresh], pa.string())]),
+                    np.concatenate([sks, seeded_sks[fresh]]),
+                    max(last_sk, int(seeded_sks.max(initial=0))))
+
+    def _write(self, hashes, keys, sks, last_sk):
+        order = np.argsort(hashes, kind="stable")
+        table = pa.table([pa.array(hashes[order]), keys.take(pa.array(order)), pa.array(sks[order])],
+                         schema=self.SCHEMA.with_metadata({"last_sk": str(last_sk)}))
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, self.path)
+
+
+def sk_registry(backend, entity, output_dir, engine=None):
+    """Surrogate-key registry of one entity for the configured backend."""
+    if backend not in SK_REGISTRY_BACKENDS:
+        raise ValueError(f"Unknown sk registry backend {backend!r}, expected one of {SK_REGISTRY_BACKENDS}")
+    if backend == "postgres":
+        return PostgresKeyRegistry(entity, engine)
+    return ArrowKeyRegistry(entity, os.path.join(output_dir, "_sk_registry", f"{entity}.arrow"))
@@ -0,0 +1,124 @@
+import re
+import pandas as pd
+
+# ==============================
+# === SCHEMA-DRIVEN CSV READER =
+# ==============================
+# Builds dtype options from schema.yml so landing files are parsed once
+# into compact types instead of object columns cast afterwards. Schema names
+# (row_id, sub_category) are matched to file headers (Row ID, Sub-Category)
+# by normalized name; headers keep their original spelling.
+#   INTEGER  → Int64       NUMERIC → float64
+#   DATE     → read as text, parsed with DATE_FORMAT (day first, never inferred)
+#   VARCHAR  → string, kept verbatim (leading zeros; nulls stay <NA>, never "nan")
+#   VARCHAR listed under `categorical:` → category
+
+SCHEMA_DTYPES = {"INTEGER": "Int64", "NUMERIC": "float64", "VARCHAR": "string"}
+ARROW_TYPES = {"Int64": "int64", "float64": "float64", "string": "string", "category": "string"}
+CSV_ENGINES = ("c", "pyarrow")
+DATE_FORMAT = "%d/%m/%Y"  # landing files carry DD/MM/YYYY dates (see dq_checks.yml)
+
+
+def normalize_name(name):
+    return re.sub(r"[^0-9a-z]+", "_", str(name).lower().strip()).strip("_")
+
+
+def resolve_schema(header, schema):
+    """{file column: schema type} for every header column the schema describes."""
+    by_name = {normalize_name(c): t for c, t in schema.items()}
+    return {col: by_name[normalize_name(col)] for col in header if normalize_name(col) in by_name}
+
+
+def read_options(header, schema, categoricals=()):
+    """dtype argument for read_csv derived from the schema, plus the DATE columns (read as text)."""
+    categoricals = {normalize_name(c) for c in categoricals}
+    dtype, date_cols = {}, []
+    for col, col_type in resolve_schema(header, schema).items():
+        if col_type == "DATE":
+            dtype[col] = "string"
+            date_cols.append(col)
+        elif col_type == "VARCHAR" and normalize_name(col) in categoricals:
+            dtype[col] = "category"
+        else:
+            dtype[col] = SCHEMA_DTYPES.get(col_type, "string")
+    return {"dtype": dtype, "date_cols": date_cols}
+
+
+def parse_dates(df, date_cols, date_format=DATE_FORMAT):
+    """Parse text DATE columns with one explicit format; values of another shape become NaT."""
+    for col in date_cols:
+        df[col] = pd.to_datetime(df[col], format=date_format, errors="coerce")
+    return df
+
+
+def cast_df_to_schema(df, schema, categoricals=(), date_format=DATE_FORMAT):
+    """Coercing cast of a frame read as strings."""
+    categoricals = {normalize_name(c) for c in categoricals}
+    for col, col_type in resolve_schema(df.columns, schema).items():
+        if col_type == "INTEGER":
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        elif col_type == "NUMERIC":
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        elif col_type == "DATE":
+            df[col] = pd.to_datetime(df[col], format=date_format, errors="coerce")
+        else:  # VARCHAR
+            df[col] = df[col].astype("category" if normalize_name(col) in categoricals else "string")
+    return df
+
+
+def csv_engine(name):
+    """Requested parser engine, falling back to "c" when pyarrow is unavailable."""
+    if name not in CSV_ENGINES:
+        raise ValueError(f"Unknown CSV engine {name!r}, expected one of {CSV_ENGINES}")
+    if name == "pyarrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("[!] pyarrow not installed, parsing with the C engine")
+            return "c"
+    return name
+
+
+def read_arrow_csv(path, sep, dtype):
+    """pyarrow.csv read with explicit column_types, so text columns are never type-inferred.
+
+    (read_csv(engine="pyarrow") infers first and casts afterwards, turning "02420" into "2420".)
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    table = pacsv.read_csv(path, parse_options=pacsv.ParseOptions(delimiter=sep),
+                           convert_options=pacsv.ConvertOptions(
+                               column_types={c: pa.type_for_alias(ARROW_TYPES[t]) for c, t in dtype.items()},
+                               strings_can_be_null=True))
+    return table.to_pandas().astype(dtype)
+
+
+def read_typed_csv(path, schema, sep="|", categoricals=(), engine="c", date_format=DATE_FORMAT):
+    """Read a landing file with schema types applied by the parser.
+
+    Files with values the typed parser rejects (e.g. text in an INTEGER column)
+    are re-read as strings and coerced column by column, so bad values become
+    nulls as before instead of failing the file.
+    """
+    header = pd.read_csv(path, sep=sep, nrows=0).columns
+    options = read_options(header, schema, categoricals)
+    try:
+        if csv_engine(engine) == "pyarrow":
+            df = read_arrow_csv(path, sep, options["dtype"])
+        else:
+            df = pd.read_csv(path, sep=sep, dtype=options["dtype"])
+    except (ValueError, TypeError) as e:
+        print(f"[!] Typed parse of {path} failed ({e}), coercing column by column")
+        return cast_df_to_schema(pd.read_csv(path, sep=sep, dtype="string"), schema, categoricals, date_format)
+
+    return parse_dates(df, options["date_cols"], date_format)
+
+
+def iter_typed_csv(path, schema, chunk_rows, sep="|", categoricals=(), date_format=DATE_FORMAT):
+    """Stream a landing file as typed chunks of at most chunk_rows rows.
+
+    Chunks are read as strings and cast with the schema (fixed date format), so
+    every chunk is typed the same way and a bad value never forces a re-read.
+    """
+    for chunk in pd.read_csv(path, sep=sep, chunksize=chunk_rows, dtype="string"):
+        yield cast_df_to_schema(chunk, schema, categoricals, date_format)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Pipeline modules live in scripts/ and are imported by bare name (as the scripts do)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
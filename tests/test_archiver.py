@@ -0,0 +1,41 @@
+import gzip
+import os
+import pytest
+import archiver
+from archiver import archive_file, archive_files
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "f.csv"
+    path.write_bytes(b"Row ID,Order ID\n" + b"1,CA-2016-152156\n" * 1000)
+    return path
+
+
+@pytest.fixture
+def archive_dir(tmp_path):
+    path = tmp_path / "archive"
+    path.mkdir()
+    return str(path)
+
+
+def test_out_of_range_level_is_clamped(source, archive_dir):
+    result = archive_file(str(source), archive_dir, "gzip", level=19)
+    with gzip.open(result["archive"], "rb") as f:
+        assert f.read().startswith(b"Row ID,Order ID\n")
+    assert not source.exists()
+
+
+def test_failed_compression_leaves_no_partial_archive(tmp_path, archive_dir):
+    with pytest.raises(FileNotFoundError):
+        archive_file(str(tmp_path / "missing.csv"), archive_dir, "gzip")
+    assert os.listdir(archive_dir) == []
+
+
+def test_zstd_fallback_uses_the_gzip_default_level(source, archive_dir, monkeypatch):
+    calls = []
+    monkeypatch.setattr(archiver, "archive_codec", lambda name: "gzip")
+    monkeypatch.setattr(archiver, "archive_file", lambda *args: calls.append(args) or
+                        {"source": args[0], "archive": "", "bytes_in": 0, "bytes_out": 0})
+    archive_files([str(source)], archive_dir, codec="zstd", level=19)
+    assert calls == [(str(source), archive_dir, "gzip", None)]
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+from entity_resolution import blocking_keys, match_clusters, minhash_signatures, normalize_names
+
+
+@pytest.mark.parametrize("names", [[], ["ab", "x", None, "  ", "Inc."]])
+def test_nothing_matchable_leaves_every_record_alone(names):
+    labels, stats = match_clusters(names)
+    assert labels.tolist() == list(range(len(names)))
+    assert stats["blocks"] == stats["pairs_compared"] == stats["matches"] == 0
+
+
+def test_blocking_keys_without_matchable_names_is_empty():
+    norm = normalize_names(["ab", None])
+    blocks = blocking_keys(norm, minhash_signatures(norm))
+    assert blocks.empty and list(blocks.columns) == ["block", "record"]
+
+
+def test_near_duplicate_names_share_a_cluster():
+    labels, _ = match_clusters(["Claire Gute", "CLAIRE GUTE Inc.", "Darrin Van Huff", "Clare Gute"])
+    assert labels[1] == labels[0] and labels[2] == 2
+    assert np.issubdtype(labels.dtype, np.integer)
@@ -0,0 +1,124 @@
+import importlib
+import sys
+import pandas as pd
+import pytest
+import sqlalchemy
+from sqlalchemy import event, text
+from sqlalchemy.pool import StaticPool
+
+CUSTOMER_COLS = ["Customer ID", "Customer Name", "Segment"]
+
+
+@pytest.fixture
+def load_dw(monkeypatch):
+    """load_dw bound to an in-memory SQLite database with attached "dw" and "prd" schemas and
+    an empty dw.dim_customers (no keys; ensure_current_key_index adds its index)."""
+    engine = sqlalchemy.create_engine("sqlite://", poolclass=StaticPool)
+
+    @event.listens_for(engine, "connect")
+    def attach_schemas(dbapi_conn, _):
+        dbapi_conn.execute("ATTACH ':memory:' AS dw")
+        dbapi_conn.execute("ATTACH ':memory:' AS prd")
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE dw.dim_customers (
+                surrogate_key INTEGER PRIMARY KEY, "Customer ID" TEXT, "Customer Name" TEXT, "Segment" TEXT,
+                hash_key TEXT, effective_from TIMESTAMP, effective_to TIMESTAMP, current_flag BOOLEAN,
+                source_info TEXT)
+        """))
+    monkeypatch.setattr(sqlalchemy, "create_engine", lambda *args, **kwargs: engine)
+    sys.modules.pop("load_dw", None)
+    module = importlib.import_module("load_dw")
+    yield module
+    sys.modules.pop("load_dw", None)
+
+
+def customers(segment):
+    return pd.DataFrame([["C-1", "Claire Gute", segment], ["C-2", "Darrin Van Huff", "Corporate"]],
+                        columns=CUSTOMER_COLS)
+
+
+def versions(load_dw):
+    return pd.read_sql('SELECT * FROM dw."dim_customers" ORDER BY surrogate_key', load_dw.engine)
+
+
+def test_changed_attribute_versions_back_and_forth(load_dw):
+    load_dw.ensure_current_key_index("dim_customers", ["Customer ID"])
+    load = lambda segment: load_dw.upsert_dim(customers(segment), "dim_customers", ["Customer ID"],
+                                              hash_cols=CUSTOMER_COLS)
+
+    assert load("Consumer") == {"inserted": 2, "expired": 0}
+    assert load("Consumer") == {"inserted": 0, "expired": 0}
+    assert load("Home Office") == {"inserted": 1, "expired": 1}
+    assert load("Consumer") == {"inserted": 1, "expired": 1}
+
+    rows = versions(load_dw)
+    c1 = rows[rows["Customer ID"] == "C-1"]
+    assert c1["Segment"].tolist() == ["Consumer", "Home Office", "Consumer"]
+    assert c1["current_flag"].astype(bool).tolist() == [False, False, True]
+    assert c1["effective_to"].iloc[:2].notna().all() and pd.isna(c1["effective_to"].iloc[2])
+    assert len(rows[rows["Customer ID"] == "C-2"]) == 1
+
+
+def test_migration_closes_legacy_duplicate_current_rows(load_dw):
+    # The original ON CONFLICT on all CUST_BK columns inserted a second current row on change
+    legacy = pd.DataFrame({
+        "surrogate_key": [1, 2, 3], "Customer ID": ["C-1", "C-1", "C-2"],
+        "Customer Name": ["Claire Gute", "Claire Gute", "Darrin Van Huff"],
+        "Segment": ["Consumer", "Home Office", "Corporate"],
+        "effective_from": pd.to_datetime(["2024-01-01", "2024-06-01", "2024-01-01"]),
+        "current_flag": True,
+    })
+    legacy.to_sql("dim_customers", load_dw.engine, schema="dw", if_exists="append", index=False)
+
+    load_dw.ensure_current_key_index("dim_customers", ["Customer ID"])
+    load_dw.ensure_current_key_index("dim_customers", ["Customer ID"])
+
+    rows = versions(load_dw)
+    assert rows["current_flag"].astype(bool).tolist() == [False, True, True]
+    assert pd.Timestamp(rows["effective_to"].iloc[0]) == pd.Timestamp("2024-06-01")
+    assert rows["effective_to"].iloc[1:].isna().all()
+
+    with pytest.raises(sqlalchemy.exc.IntegrityError), load_dw.engine.begin() as conn:
+        conn.execute(text('INSERT INTO dw.dim_customers (surrogate_key, "Customer ID", current_flag) '
+                          "VALUES (4, 'C-1', true)"))
+    assert load_dw.upsert_dim(customers("Corporate").iloc[[0]], "dim_customers", ["Customer ID"],
+                              hash_cols=CUSTOMER_COLS)["expired"] == 1
+
+
+def test_pandas_fact_lookup_uses_current_rows_and_date_keys(load_dw):
+    dims = {
+        "dim_customers": pd.DataFrame({"surrogate_key": [1, 2], "Customer ID": ["C-1", "C-1"],
+                                       "Customer Name": ["Claire Gute", "Claire Gute-Smith"],
+                                       "Segment": ["Consumer", "Consumer"], "current_flag": [False, True]}),
+        "dim_products": pd.DataFrame({"surrogate_key": [7], "Product ID": ["P-1"], "current_flag": [True]}),
+        "dim_countries": pd.DataFrame({"surrogate_key": [9], "Country": ["United States"], "City": ["Henderson"],
+                                       "State": ["Kentucky"], "Postal Code": ["42420"], "Region": ["South"],
+                                       "current_flag": [True]}),
+        "dim_date": pd.DataFrame({"date_key": [20161108], "full_date": ["08-11-2016"], "current_flag": [True]}),
+    }
+    for table, df in dims.items():
+        df.to_sql(table, load_dw.engine, schema="dw", if_exists="append", index=False)
+    with load_dw.engine.begin() as conn:
+        conn.execute(text(f'CREATE TABLE dw."{load_dw.FACT_TABLE}" ("Order ID" TEXT PRIMARY KEY, '
+                          + ", ".join(f'"{c}"' for c in load_dw.FACT_COLS[1:]) + ")"))
+        conn.execute(text('CREATE TABLE dw."etl_watermarks" (name TEXT PRIMARY KEY, watermark TIMESTAMP)'))
+    pd.DataFrame({
+        "Row ID": [1, 2], "Order ID": ["CA-2016-152156"] * 2, "Customer ID": ["C-1"] * 2, "Product ID": ["P-1"] * 2,
+        "Country": ["United States"] * 2, "City": ["Henderson"] * 2, "State": ["Kentucky"] * 2,
+        "Postal Code": ["42420"] * 2, "Region": ["South"] * 2,
+        "Order Date": pd.to_datetime(["2016-11-08"] * 2), "Ship Date": pd.to_datetime(["2016-11-11"] * 2),
+        "Sales": [261.96, 731.94], "Quantity": [2, 3], "Discount": [0.0, 0.0], "Profit": [41.91, 219.58],
+        "Ship Mode": ["Second Class"] * 2, "changetype": ["I"] * 2, "is_deleted": [False] * 2,
+        "last_modified_at": pd.to_datetime(["2024-01-01"] * 2),
+    }).to_sql("prd_orders", load_dw.engine, schema="prd", index=False)
+
+    load_dw.load_fact_pandas(None)
+
+    fact = pd.read_sql(f'SELECT * FROM dw."{load_dw.FACT_TABLE}"', load_dw.engine)
+    assert len(fact) == 1
+    row = fact.iloc[0]
+    assert (row["customer_sk"], row["product_sk"], row["country_sk"]) == (2, 7, 9)
+    assert row["order_date_sk"] == 20161108 and pd.isna(row["ship_date_sk"])
+    assert row["Sales"] == 731.94
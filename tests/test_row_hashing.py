@@ -0,0 +1,36 @@
+import hashlib
+import numpy as np
+import pandas as pd
+import pytest
+from row_hashing import hash_frame
+
+
+def legacy_row_hash(row, na_as_null=True):
+    """The per-row helper hash_frame replaced (load_to_stg_prd.py / load_dw.py)."""
+    def is_null(v):
+        return v is None or (na_as_null and pd.isna(v))
+    vals = ["<NULL>" if is_null(v) or str(v).strip() == "" else str(v).strip().upper() for v in row]
+    return hashlib.sha256("||".join(vals).encode("utf-8")).hexdigest()
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "name": ["Straße", " ǆemal ", "ﬁne", "İstanbul", "Ωmega", "  ", None],
+        "city": pd.Series(["münchen", "ŁÓDŹ", "groß-gerau", "", np.nan, "ß", "x"], dtype="string"),
+        "qty": pd.array([1, None, 3, 4, 5, 6, 7], dtype="Int64"),
+        "sales": [1.5, np.nan, 0.1, 2.0, -3.25, 1e20, 7.0],
+        "order_date": pd.to_datetime(["2016-11-08", None, "2016-11-13", "2016-11-08", "2017-01-01",
+                                      "2016-11-08", "2018-02-28"]),
+    })
+
+
+@pytest.mark.parametrize("na_as_null", [True, False])
+def test_sha256_matches_legacy_row_hash(frame, na_as_null):
+    expected = [legacy_row_hash(row, na_as_null) for row in frame.astype(object).itertuples(index=False)]
+    assert hash_frame(frame, na_as_null=na_as_null).tolist() == expected
+
+
+def test_sharp_s_upper_cases_like_python(frame):
+    only_name = frame[["name"]].iloc[:1]
+    assert hash_frame(only_name).iloc[0] == hashlib.sha256("STRASSE".encode("utf-8")).hexdigest()
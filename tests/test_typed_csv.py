@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+from typed_csv import read_typed_csv, iter_typed_csv
+
+SCHEMA = {"row_id": "INTEGER", "postal_code": "VARCHAR", "order_date": "DATE",
+          "segment": "VARCHAR", "sales": "NUMERIC"}
+ROWS = ["1|02420|08/11/2016|Consumer|1.5",
+        "2|00501|13/11/2016|Corporate|2.0",
+        "3||31/12/2016|Consumer|",
+        "4|10024|2016-11-08|Home Office|3.25"]
+
+
+@pytest.fixture
+def landing_file(tmp_path):
+    path = tmp_path / "012016_orders_2016_11_30_00_00_00.csv"
+    path.write_text("Row ID|Postal Code|Order Date|Segment|Sales\n" + "\n".join(ROWS) + "\n")
+    return str(path)
+
+
+def check_frame(df):
+    assert df["Postal Code"].tolist()[:2] == ["02420", "00501"]
+    assert df["Postal Code"].isna().tolist() == [False, False, True, False]
+    assert df["Order Date"].tolist()[:3] == [pd.Timestamp(2016, 11, 8), pd.Timestamp(2016, 11, 13),
+                                             pd.Timestamp(2016, 12, 31)]
+    assert pd.isna(df["Order Date"].iloc[3])  # not DD/MM/YYYY
+    assert df["Row ID"].dtype == "Int64"
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_read_typed_csv_keeps_leading_zeros_and_day_first_dates(landing_file, engine):
+    check_frame(read_typed_csv(landing_file, SCHEMA, categoricals=["segment"], engine=engine))
+
+
+def test_read_typed_csv_coercing_fallback(landing_file, tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text(open(landing_file).read() + "x|99999|01/01/2017|Consumer|1\n")
+    df = read_typed_csv(str(path), SCHEMA, engine="pyarrow")
+    check_frame(df.iloc[:4])
+    assert pd.isna(df["Row ID"].iloc[4]) and df["Postal Code"].iloc[4] == "99999"
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 10])
+def test_iter_typed_csv_matches_full_read(landing_file, chunk_rows):
+    df = pd.concat(iter_typed_csv(landing_file, SCHEMA, chunk_rows), ignore_index=True)
+    check_frame(df)
+
+
+def test_iter_typed_csv_same_types_in_every_chunk(tmp_path):
+    # A bad INTEGER in a later chunk must not change how earlier or later chunks are typed
+    path = tmp_path / "chunks.csv"
+    rows = ROWS[:3] + ["x|02421|14/11/2016|Consumer|1"] + ROWS[:3]
+    path.write_text("Row ID|Postal Code|Order Date|Segment|Sales\n" + "\n".join(rows) + "\n")
+    chunks = list(iter_typed_csv(str(path), SCHEMA, 2))
+    assert [len(c) for c in chunks] == [2, 2, 2, 1]
+    df = pd.concat(chunks, ignore_index=True)
+    assert df["Order Date"].notna().all()
+    assert df["Postal Code"].iloc[3] == "02421" and pd.isna(df["Row ID"].iloc[3])
+    assert {str(c["Order Date"].dtype) for c in chunks} == {str(chunks[0]["Order Date"].dtype)}